@@ -0,0 +1,52 @@
+"""同じ形の計算グラフで逆伝播を繰り返すとき、BackwardPlanで順番を使い回した場合とそうでない場合を比べるベンチマーク。
+
+実行方法:
+    $ python benchmarks/backward_plan.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+import numpy as np
+from dezero import Variable, BackwardPlan, square, exp, add
+
+
+def model(xs):
+    """小さな演算をたくさん含む計算グラフ。"""
+    y = square(xs[0])
+    for x in xs[1:]:
+        y = add(y, exp(square(x)))
+    return y
+
+
+def measure(n, steps, use_plan):
+    plan = None
+    elapsed = 0.0
+    for _ in range(steps):
+        xs = [Variable(np.array(i / n)) for i in range(n)]
+        y = model(xs)
+        if use_plan and plan is None:
+            plan = BackwardPlan.record(y)
+        start = time.perf_counter()
+        y.backward(plan=plan)
+        elapsed += time.perf_counter() - start
+    return elapsed / steps
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--steps', type=int, default=20)
+    args = parser.parse_args()
+
+    print('{:>8} {:>16} {:>16}'.format('inputs', 'heap [ms/step]', 'plan [ms/step]'))
+    for n in args.sizes:
+        heap = measure(n, args.steps, use_plan=False)
+        plan = measure(n, args.steps, use_plan=True)
+        print('{:>8} {:>16.3f} {:>16.3f}'.format(n, heap * 1e3, plan * 1e3))
+
+
+if __name__ == '__main__':
+    main()
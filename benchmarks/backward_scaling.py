@@ -0,0 +1,76 @@
+"""Variable.backwardの実行時間がグラフのノード数に対してほぼ線形に伸びることを確認するベンチマーク。
+
+実行方法:
+    $ python benchmarks/backward_scaling.py
+    $ python benchmarks/backward_scaling.py --sizes 1000 10000
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+import numpy as np
+from dezero import Variable, square, add
+
+
+def build_wide(n):
+    """n個の葉をsquareしてから順に足し合わせる。逆伝播の待ち行列にはn個近くの関数が溜まる。"""
+    xs = [Variable(np.array(float(i))) for i in range(n)]
+    y = square(xs[0])
+    for x in xs[1:]:
+        y = add(y, square(x))
+    return xs, y
+
+
+def sorted_backward(y):
+    """ヒープ化する前の「追加のたびにsortする」逆伝播。比較用。"""
+    y.grad = np.ones_like(y.data)
+    funcs = []
+    seen_set = set()
+
+    def add_func(f):
+        if f not in seen_set:
+            funcs.append(f)
+            seen_set.add(f)
+            funcs.sort(key=lambda x: x.generation)
+
+    add_func(y.creator)
+    while funcs:
+        f = funcs.pop()
+        gys = [output().grad for output in f.outputs]
+        gxs = f.backward(*gys)
+        if not isinstance(gxs, tuple):
+            gxs = gxs,
+        for x, gx in zip(f.inputs, gxs):
+            x.grad = gx if x.grad is None else x.grad + gx
+            if x.creator is not None:
+                add_func(x.creator)
+
+
+def measure(n, backward):
+    xs, y = build_wide(n)
+    start = time.perf_counter()
+    backward(y)
+    elapsed = time.perf_counter() - start
+    assert xs[-1].grad == 2 * (n - 1)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--sorted-limit', type=int, default=10000,
+                        help='sortによる逆伝播を比較として計測する最大ノード数')
+    args = parser.parse_args()
+
+    print('{:>10} {:>12} {:>14} {:>12}'.format('nodes', 'heap [s]', 'heap [us/node]', 'sort [s]'))
+    for n in args.sizes:
+        nodes = 2 * n - 1  # Square n個 + Add n-1個
+        heap_time = measure(n, lambda y: y.backward())
+        sort_time = measure(n, sorted_backward) if n <= args.sorted_limit else float('nan')
+        print('{:>10} {:>12.4f} {:>14.3f} {:>12.4f}'.format(nodes, heap_time, heap_time / nodes * 1e6, sort_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""squareを繰り返す長い連鎖で、チェックポイントの有無による逆伝播中の最大メモリと時間を比べるベンチマーク。
+
+実行方法:
+    $ python benchmarks/checkpoint.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from dezero import Variable, square
+from dezero.checkpoint import checkpoint_sequential
+
+
+def run(n, size, **kwargs):
+    x = Variable(np.ones(size))
+    tracemalloc.start()
+    start = time.perf_counter()
+    y = checkpoint_sequential([square] * n, x, **kwargs)
+    y.backward()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--depths', type=int, nargs='+', default=[16, 64, 256])
+    parser.add_argument('--size', type=int, default=100000)
+    args = parser.parse_args()
+
+    nbytes = np.ones(args.size).nbytes
+    print('{:>6} {:>10} {:>10} {:>12}'.format('depth', 'mode', 'time [ms]', 'peak [MiB]'))
+    for n in args.depths:
+        modes = [
+            ('plain', {'segment': 1}),
+            ('sqrt', {}),
+            ('budget', {'max_bytes': nbytes * n // 2}),
+        ]
+        for name, kwargs in modes:
+            elapsed, peak = run(n, args.size, **kwargs)
+            print('{:>6} {:>10} {:>10.2f} {:>12.2f}'.format(n, name, elapsed * 1e3, peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
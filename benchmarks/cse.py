@@ -0,0 +1,53 @@
+"""同じ部分式を何度も含む計算グラフで、CSETableの有無による順伝播・逆伝播の時間を比べるベンチマーク。
+
+実行方法:
+    $ python benchmarks/cse.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+import numpy as np
+from dezero import Variable, square, exp, add, using_config
+from dezero.cse import CSETable
+
+
+def model(x, repeats):
+    """exp(square(x))をrepeats回足し合わせる。生成したモデルに多い、同じ部分式を繰り返す形。"""
+    y = exp(square(exp(square(x))))
+    for _ in range(repeats - 1):
+        y = add(y, exp(square(exp(square(x)))))
+    return y
+
+
+def measure(data, repeats, table, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        with using_config('cse', table):
+            x = Variable(data)
+            start = time.perf_counter()
+            model(x, repeats).backward()
+            best = min(best, time.perf_counter() - start)
+    return best, x.grad
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeats', type=int, nargs='+', default=[1, 2, 8])
+    parser.add_argument('--size', type=int, default=10 ** 5)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    data = np.random.rand(args.size) * 0.5
+    print('{:>8} {:>10} {:>10} {:>10}'.format('repeats', 'off [ms]', 'on [ms]', 'speedup'))
+    for repeats in args.repeats:
+        off, g0 = measure(data, repeats, None, args.repeat)
+        on, g1 = measure(data, repeats, CSETable(), args.repeat)
+        assert np.allclose(g0, g1)
+        print('{:>8} {:>10.2f} {:>10.2f} {:>10.2f}'.format(repeats, off * 1e3, on * 1e3, off / on))
+
+
+if __name__ == '__main__':
+    main()
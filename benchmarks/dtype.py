@@ -0,0 +1,55 @@
+"""Config.dtypeを変えて、順伝播・逆伝播の時間と最大メモリを比べるベンチマーク。
+
+実行方法:
+    $ python benchmarks/dtype.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from dezero import Variable, square, exp, add, using_config
+
+
+def model(x):
+    y = x
+    for _ in range(8):
+        y = add(square(y), x)
+    return exp(y)
+
+
+def measure(data, dtype, repeat):
+    best = float('inf')
+    with using_config('dtype', dtype):
+        for _ in range(repeat):
+            x = Variable(data)
+            start = time.perf_counter()
+            model(x).backward()
+            best = min(best, time.perf_counter() - start)
+        x = Variable(data)
+        tracemalloc.start()
+        model(x).backward()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=10 ** 6)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print('{:>10} {:>10} {:>12}'.format('dtype', 'time [ms]', 'peak [MiB]'))
+    for dtype in (None, np.float32, np.float16):
+        data = (np.random.rand(args.size) * 0.1).astype(dtype or np.float64)  # 末端の変数も同じ型で作る。
+        elapsed, peak = measure(data, dtype, args.repeat)
+        name = 'float64' if dtype is None else np.dtype(dtype).name
+        print('{:>10} {:>10.2f} {:>12.2f}'.format(name, elapsed * 1e3, peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""一つの変数が多数の関数に入力される(ファンアウトする)グラフで、微分値の足し込みにかかる時間を計測するベンチマーク。
+
+実行方法:
+    $ python benchmarks/fanout_accumulation.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from dezero import Variable, square, add
+
+
+def build_fan_out(x, width):
+    """xをwidth個のsquareに入力し、その出力を足し合わせる。"""
+    y = square(x)
+    for _ in range(width - 1):
+        y = add(y, square(x))
+    return y
+
+
+def measure(width, size):
+    x = Variable(np.random.randn(size))
+    y = build_fan_out(x, width)
+    tracemalloc.start()
+    start = time.perf_counter()
+    y.backward()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert np.allclose(x.grad, 2 * width * x.data)
+    return elapsed, peak / x.data.nbytes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--widths', type=int, nargs='+', default=[2, 10, 100, 1000])
+    parser.add_argument('--size', type=int, default=100000)
+    args = parser.parse_args()
+
+    print('{:>8} {:>12} {:>16} {:>16}'.format('width', 'time [s]', 'time/width [us]', 'peak [arrays]'))
+    for width in args.widths:
+        elapsed, peak = measure(width, args.size)
+        print('{:>8} {:>12.4f} {:>16.1f} {:>16.1f}'.format(width, elapsed, elapsed / width * 1e6, peak))
+
+
+if __name__ == '__main__':
+    main()
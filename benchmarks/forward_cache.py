@@ -0,0 +1,56 @@
+"""同じ小さな入力でnumerical_diffを繰り返す勾配チェックで、ForwardCacheの有無による時間を比べるベンチマーク。
+
+実行方法:
+    $ python benchmarks/forward_cache.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+import numpy as np
+from dezero import Variable, square, exp, using_config
+from dezero.forward_cache import ForwardCache
+from dezero.utils import numerical_diff
+
+
+def f(x):
+    for _ in range(2):
+        x = square(exp(square(x)))
+    return exp(x)
+
+
+def measure(xs, iterations, cache, repeat):
+    """repeat回計り、最も速かった時間を返す。"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with using_config('forward_cache', cache):
+            for _ in range(iterations):
+                for x in xs:
+                    numerical_diff(f, x)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 100, 10000])
+    parser.add_argument('--inputs', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print('{:>8} {:>10} {:>10} {:>10} {:>8}'.format('size', 'off [ms]', 'on [ms]', 'speedup', 'hits'))
+    for size in args.sizes:
+        xs = [Variable(np.random.rand(size) * 0.01) for _ in range(args.inputs)]
+        cache = ForwardCache()
+        measure(xs, 1, cache, 1)  # キャッシュを温めておき、ヒットしたときの時間だけを比べる。
+        off = measure(xs, args.iterations, None, args.repeat)
+        on = measure(xs, args.iterations, cache, args.repeat)
+        print('{:>8} {:>10.2f} {:>10.2f} {:>10.2f} {:>8}'.format(size, off * 1e3, on * 1e3, off / on, cache.hits))
+
+
+if __name__ == '__main__':
+    main()
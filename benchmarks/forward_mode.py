@@ -0,0 +1,76 @@
+"""入力が少なく出力が多い(縦長のヤコビ行列を持つ)関数で、前進モードと逆伝播でヤコビ行列を求める時間を比べるベンチマーク。
+
+前進モードは入力の数だけ、逆伝播は出力の数だけ計算グラフをたどる。
+
+実行方法:
+    $ python benchmarks/forward_mode.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+import numpy as np
+from dezero import Variable, square, exp, add
+from dezero.utils import jvp
+
+
+def make_model(n_inputs, n_outputs):
+    cs = [Variable(np.random.rand(n_outputs)) for _ in range(n_inputs)]
+
+    def model(*xs):
+        y = exp(add(square(xs[0]), cs[0]))
+        for x, c in zip(xs[1:], cs[1:]):
+            y = add(y, exp(add(square(x), c)))  # スカラーの入力をn_outputs個の出力へブロードキャストする。
+        return y
+    return model
+
+
+def jacobian_forward(model, xs):
+    columns = []
+    for i in range(len(xs)):
+        vs = [np.array(float(i == j)) for j in range(len(xs))]
+        _, ty = jvp(model, xs, vs)
+        columns.append(ty)
+    return np.stack(columns, axis=1)
+
+
+def jacobian_reverse(model, xs):
+    y = model(*xs)
+    rows = []
+    for i in range(y.data.size):
+        for x in xs:
+            x.cleargrad()
+        y.grad = np.zeros_like(y.data)
+        y.grad[i] = 1.0
+        y.backward(retain_graph=True)
+        rows.append([x.grad for x in xs])
+    return np.array(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--inputs', type=int, default=2)
+    parser.add_argument('--outputs', type=int, nargs='+', default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    print('{:>8} {:>8} {:>14} {:>14}'.format('inputs', 'outputs', 'forward [ms]', 'reverse [ms]'))
+    for m in args.outputs:
+        model = make_model(args.inputs, m)
+        xs = [Variable(np.array(0.1 * (i + 1))) for i in range(args.inputs)]
+
+        start = time.perf_counter()
+        jf = jacobian_forward(model, xs)
+        forward_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        jr = jacobian_reverse(model, xs)
+        reverse_time = time.perf_counter() - start
+
+        assert np.allclose(jf, jr)
+        print('{:>8} {:>8} {:>14.3f} {:>14.3f}'.format(args.inputs, m, forward_time * 1e3, reverse_time * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""FunctionHookの有無で、小さな配列の順伝播・逆伝播の時間を比べ、ProfileHookの集計を表示するベンチマーク。
+
+実行方法:
+    $ python benchmarks/function_hooks.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import contextlib
+import time
+import numpy as np
+from dezero import Variable, square, exp, mul
+from dezero.function_hooks import FunctionHook, ProfileHook
+
+
+def model(x):
+    y = x
+    for _ in range(20):
+        y = mul(exp(square(y)), x)
+    return y
+
+
+def measure(data, iterations, hook):
+    best = float('inf')
+    for _ in range(5):
+        with hook if hook is not None else contextlib.nullcontext():
+            start = time.perf_counter()
+            for _ in range(iterations):
+                model(Variable(data)).backward()
+            best = min(best, time.perf_counter() - start)
+    return best / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    data = 0.3 + np.random.rand(args.size) * 0.01
+    profile = ProfileHook()
+    print('{:>10} {:>12}'.format('hook', 'time [us]'))
+    for name, hook in (('off', None), ('noop', FunctionHook()), ('profile', profile)):
+        print('{:>10} {:>12.1f}'.format(name, measure(data, args.iterations, hook) * 1e6))
+    print()
+    profile.print_report()
+
+
+if __name__ == '__main__':
+    main()
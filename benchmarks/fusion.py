@@ -0,0 +1,49 @@
+"""要素ごとの関数の連鎖をfuseでまとめた場合とまとめない場合の、実行時間と最大メモリを比べるベンチマーク。
+
+実行方法:
+    $ python benchmarks/fusion.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from dezero import Variable, square, exp
+from dezero.fusion import fuse
+
+
+def chain(x):
+    return square(square(square(exp(square(x)))))
+
+
+def measure(fn, data):
+    x = Variable(data.copy())
+    tracemalloc.start()
+    start = time.perf_counter()
+    y = fn(x)
+    y.backward()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / data.nbytes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 1000000, 10000000])
+    args = parser.parse_args()
+
+    fused = fuse(chain)
+    print('{:>10} {:>8} {:>12} {:>14}'.format('size', 'mode', 'time [s]', 'peak [arrays]'))
+    for size in args.sizes:
+        data = np.random.rand(size) * 0.1
+        for name, fn in (('plain', chain), ('fused', fused)):
+            elapsed, peak = measure(fn, data)
+            print('{:>10} {:>8} {:>12.4f} {:>14.1f}'.format(size, name, elapsed, peak))
+
+
+if __name__ == '__main__':
+    main()
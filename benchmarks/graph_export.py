@@ -0,0 +1,67 @@
+"""計算グラフをsave_graphで書き出し、load_graphで読み込んで実行するまでの時間を、Pythonで作り直す場合と比べるベンチマーク。
+
+実行方法:
+    $ python benchmarks/graph_export.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from dezero import Variable, square, exp, add, mul
+from dezero.serialize import save_graph, load_graph
+
+
+def make_model(depth, size):
+    ws = [Variable(np.random.rand(size) * 0.1) for _ in range(depth)]
+
+    def model(x):
+        y = x
+        for w in ws:
+            y = add(mul(exp(square(y)), w), x)
+        return y
+    return model
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--depths', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--size', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print('{:>6} {:>10} {:>10} {:>10} {:>10} {:>12} {:>12}'.format(
+        'depth', 'file [KiB]', 'save [ms]', 'load [ms]', 'run [ms]', 'python [ms]', 'static [ms]'))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'graph.dzg')
+        for depth in args.depths:
+            model = make_model(depth, args.size)
+            x = Variable(np.random.rand(args.size) * 0.1)
+            y = model(x)
+            save_s, _ = best_of(lambda: save_graph(path, y, inputs=[x]), args.repeat)
+            load_s, graph = best_of(lambda: load_graph(path), args.repeat)
+            run_s, out = best_of(lambda: graph.run(x.data), args.repeat)
+            python_s, expected = best_of(lambda: model(Variable(x.data)), args.repeat)
+            assert np.allclose(out.data, expected.data)
+            static = graph.compile()
+            static_s, _ = best_of(lambda: static.forward(x.data), args.repeat)
+            print('{:>6} {:>10.1f} {:>10.2f} {:>10.2f} {:>10.2f} {:>12.2f} {:>12.2f}'.format(
+                depth, os.path.getsize(path) / 1024, save_s * 1e3, load_s * 1e3, run_s * 1e3,
+                python_s * 1e3, static_s * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""ヘッセ行列とベクトルの積を、create_graphの逆伝播と数値微分で求める時間と誤差を比べるベンチマーク。
+
+数値微分は微分値をベクトルvの方向に中心差分するので逆伝播が2回、create_graphは微分値の計算グラフからの逆伝播が1回追加で要る。
+
+実行方法:
+    $ python benchmarks/hvp.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+import numpy as np
+from dezero import Variable, square, exp, add, mul
+from dezero.utils import hvp
+
+
+def model(x):
+    return add(exp(mul(x, x)), square(square(x)))
+
+
+def exact(x, v):
+    """modelのヘッセ行列(対角)とvの積の解析解。"""
+    return ((2 + 4 * x ** 2) * np.exp(x ** 2) + 12 * x ** 2) * v
+
+
+def hvp_numerical(f, x, v, eps=1e-4):
+    def grad(data):
+        x = Variable(data)
+        f(x).backward()
+        return x.grad
+    return (grad(x.data + eps * v) - grad(x.data - eps * v)) / (2 * eps)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print('{:>8} {:>12} {:>12} {:>12} {:>12}'.format('size', 'graph [ms]', 'graph err', 'numeric [ms]', 'numeric err'))
+    for size in args.sizes:
+        x = Variable(np.random.rand(size) * 0.5)
+        v = np.random.rand(size)
+        expected = exact(x.data, v)
+        row = [size]
+        for method in (hvp, hvp_numerical):
+            best = float('inf')
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                hv = method(model, x, v)
+                best = min(best, time.perf_counter() - start)
+            row += [best * 1e3, np.max(np.abs(hv - expected))]
+        print('{:>8} {:>12.3f} {:>12.2e} {:>12.3f} {:>12.2e}'.format(*row))
+
+
+if __name__ == '__main__':
+    main()
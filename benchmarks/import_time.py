@@ -0,0 +1,58 @@
+"""新しいプロセスでモジュールを読み込む時間と、一緒に読み込まれる任意の依存を調べるベンチマーク。
+
+dezeroの読み込みはnumpyの読み込みとほぼ同じ時間で済み、memory_profilerやconcurrent.futuresを読み込まないことを確かめる。
+
+実行方法:
+    $ python benchmarks/import_time.py
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+OPTIONAL = ('memory_profiler', 'concurrent.futures', 'logging')
+
+CODE = '''
+import json, sys, time
+sys.path[:0] = {paths!r}
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {optional!r} if m in sys.modules]}}))
+'''
+
+MODULES = {
+    'numpy': 'numpy',
+    'dezero': 'dezero',
+    'step17': 'step17',
+}
+
+
+def measure(module, repeat):
+    paths = [ROOT, os.path.join(ROOT, 'steps')]
+    code = CODE.format(paths=paths, module=module, optional=OPTIONAL)
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+        result = json.loads(out)
+        times.append(result['seconds'])
+    return statistics.median(times), result['loaded']
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    print('{:>8} {:>12}  {}'.format('module', 'median [ms]', 'optional modules loaded'))
+    for name, module in MODULES.items():
+        seconds, loaded = measure(module, args.repeat)
+        print('{:>8} {:>12.1f}  {}'.format(name, seconds * 1e3, ', '.join(loaded) or '-'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""学習ループのように同じ形の計算を繰り返すとき、MemoryPoolを使った場合と使わない場合を比べるベンチマーク。
+
+実行方法:
+    $ python benchmarks/memory_pool.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+import numpy as np
+from dezero import Variable, using_config, square, exp, add
+from dezero.memory_pool import MemoryPool
+
+
+def step(data):
+    x = Variable(data)
+    a = square(x)
+    y = add(square(exp(a)), square(a))
+    y.backward()
+    return x.grad
+
+
+def measure(data, iters, pool):
+    with using_config('memory_pool', pool):
+        start = time.perf_counter()
+        for _ in range(iters):
+            step(data)
+        return (time.perf_counter() - start) / iters
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--iters', type=int, default=50)
+    args = parser.parse_args()
+
+    print('{:>9} {:>14} {:>14} {:>8} {:>8}'.format('size', 'plain [ms]', 'pool [ms]', 'hits', 'misses'))
+    for size in args.sizes:
+        data = np.random.rand(size) * 0.5
+        plain = measure(data, args.iters, None)
+        pool = MemoryPool()
+        pooled = measure(data, args.iters, pool)
+        print('{:>9} {:>14.3f} {:>14.3f} {:>8} {:>8}'.format(size, plain * 1e3, pooled * 1e3, pool.hits, pool.misses))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""steps/step17.pyのshow_memと同じループで、no_grad有無のメモリ使用量を比べるベンチマーク。
+
+実行方法:
+    $ python benchmarks/no_grad_memory.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import tracemalloc
+import numpy as np
+from dezero import Variable, square, no_grad
+
+
+def show_mem(iters, size):
+    """step17のshow_memと同じループ。ループ中の最大メモリと終了時に残っているメモリを返す。"""
+    tracemalloc.start()
+    for i in range(iters):
+        x = Variable(np.random.randn(size))
+        y = square(square(square(x)))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iters', type=int, default=100)
+    parser.add_argument('--size', type=int, default=1000000)
+    args = parser.parse_args()
+
+    array_mib = args.size * 8 / 2 ** 20
+    print('1配列あたり {:.1f} MiB'.format(array_mib))
+    print('{:>10} {:>14} {:>14}'.format('mode', 'current [MiB]', 'peak [MiB]'))
+    current, peak = show_mem(args.iters, args.size)
+    print('{:>10} {:>14.1f} {:>14.1f}'.format('backprop', current / 2 ** 20, peak / 2 ** 20))
+    with no_grad():
+        current, peak = show_mem(args.iters, args.size)
+    print('{:>10} {:>14.1f} {:>14.1f}'.format('no_grad', current / 2 ** 20, peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""計算グラフの1ノード(Function 1つと出力のVariable 1つ)あたりのメモリ量と、グラフを作る速さを計測するベンチマーク。
+
+実行方法:
+    $ python benchmarks/node_footprint.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from dezero import Variable, square
+
+
+def build_chain(x, n):
+    """squareをn回合成した計算グラフを作る。"""
+    y = x
+    for _ in range(n):
+        y = square(y)
+    return y
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=100000)
+    args = parser.parse_args()
+    n = args.nodes
+
+    x = Variable(np.array(1.0))
+    tracemalloc.start()
+    y = build_chain(x, n)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del y
+
+    start = time.perf_counter()
+    y = build_chain(x, n)
+    elapsed = time.perf_counter() - start
+
+    array_bytes = y.data.__sizeof__()
+    print('nodes          : {}'.format(n))
+    print('bytes/node     : {:.1f} (ndarray {} を含む)'.format(current / n, array_bytes))
+    print('nodes/sec      : {:.0f}'.format(n / elapsed))
+
+
+if __name__ == '__main__':
+    main()
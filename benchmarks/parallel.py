@@ -0,0 +1,50 @@
+"""大きな配列のsquareとexpの順伝播・逆伝播を、スレッドの数を変えて計測するベンチマーク。
+
+Config.num_threadsで要素ごとの計算を連続した区間に分け、共有のスレッドプールで並列に実行する。
+
+実行方法:
+    $ python benchmarks/parallel.py --threads 1 2 4 8
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import os
+import time
+import numpy as np
+from dezero import Variable, square, exp, using_config
+
+
+def measure(size, num_threads, repeat):
+    data = np.random.rand(size) * 0.5
+    best = float('inf')
+    with using_config('num_threads', num_threads):
+        for _ in range(repeat):
+            x = Variable(data)
+            start = time.perf_counter()
+            y = exp(square(exp(square(x))))
+            y.backward()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 4, 10 ** 6, 10 ** 7])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print('cpu_count: {}'.format(os.cpu_count()))
+    print('{:>10} {:>8} {:>10} {:>10}'.format('size', 'threads', 'time [ms]', 'speedup'))
+    for size in args.sizes:
+        base = None
+        for n in args.threads:
+            t = measure(size, n, args.repeat)
+            base = t if base is None else base
+            print('{:>10} {:>8} {:>10.2f} {:>10.2f}'.format(size, n, t * 1e3, base / t))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""独立な枝が並ぶ幅の広い計算グラフで、逐次の逆伝播とparallel=Trueの逆伝播の時間を比べるベンチマーク。
+
+実行方法:
+    $ python benchmarks/parallel_backward.py --widths 2 4 8 16
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import os
+import time
+import numpy as np
+from dezero import Variable, square, exp, add
+
+
+def wide(xs, depth):
+    """入力ごとにsquareとexpをdepth回重ねた枝を作り、最後に足し合わせる。"""
+    branches = []
+    for x in xs:
+        for _ in range(depth):
+            x = exp(square(x))
+        branches.append(x)
+    y = branches[0]
+    for b in branches[1:]:
+        y = add(y, b)
+    return y
+
+
+def measure(width, depth, size, parallel, repeat):
+    data = np.random.rand(width, size) * 0.1
+    best = float('inf')
+    for _ in range(repeat):
+        xs = [Variable(d) for d in data]
+        y = wide(xs, depth)
+        start = time.perf_counter()
+        y.backward(parallel=parallel)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--widths', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--size', type=int, default=10 ** 6)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    # スレッドプールの作成(とconcurrent.futuresの読み込み)を計らないよう、計る前に一度並列に逆伝播しておく。
+    wide([Variable(np.random.rand(8)) for _ in range(2)], 1).backward(parallel=True)
+
+    print('cpu_count: {}'.format(os.cpu_count()))
+    print('{:>6} {:>12} {:>14} {:>10}'.format('width', 'serial [ms]', 'parallel [ms]', 'speedup'))
+    for width in args.widths:
+        serial = measure(width, args.depth, args.size, False, args.repeat)
+        parallel = measure(width, args.depth, args.size, True, args.repeat)
+        print('{:>6} {:>12.2f} {:>14.2f} {:>10.2f}'.format(width, serial * 1e3, parallel * 1e3, serial / parallel))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""サンプルごとの微分値を、サンプルごとに逆伝播するループとvmap_gradで求める時間を比べるベンチマーク。
+
+実行方法:
+    $ python benchmarks/per_example_grad.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+import numpy as np
+from dezero import Variable, square, exp, mul, add
+from dezero.utils import vmap_grad
+
+
+def model(x, w):
+    return add(exp(mul(square(x), w)), square(w))
+
+
+def loop(xs, w):
+    gxs, gws = [], []
+    for data in xs.data:
+        x = Variable(data)
+        w.cleargrad()
+        model(x, w).backward()
+        gxs.append(x.grad)
+        gws.append(w.grad)
+    return np.stack(gxs), np.stack(gws)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--batches', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--features', type=int, default=100)
+    args = parser.parse_args()
+
+    print('{:>8} {:>12} {:>12} {:>10}'.format('batch', 'loop [ms]', 'vmap [ms]', 'speedup'))
+    for batch in args.batches:
+        xs = Variable(np.random.rand(batch, args.features))
+        w = Variable(np.random.rand(args.features))
+
+        start = time.perf_counter()
+        expected = loop(xs, w)
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = vmap_grad(model, [xs, w], in_axes=[0, None])
+        vmap_time = time.perf_counter() - start
+
+        assert all(np.allclose(a, e) for a, e in zip(actual, expected))
+        print('{:>8} {:>12.3f} {:>12.3f} {:>10.1f}'.format(batch, loop_time * 1e3, vmap_time * 1e3, loop_time / vmap_time))
+
+
+if __name__ == '__main__':
+    main()
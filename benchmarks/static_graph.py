@@ -0,0 +1,58 @@
+"""小さな配列で、毎回計算グラフを作るDefine-by-Runと、traceで変換したStaticGraphの1回あたりの時間を比べるベンチマーク。
+
+実行方法:
+    $ python benchmarks/static_graph.py
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import time
+import numpy as np
+from dezero import Variable, square, exp, add
+from dezero.static import trace
+
+
+def model(x):
+    """steps/step16.pyの計算グラフとsteps/step09.pyの合成関数を組み合わせたもの。"""
+    a = square(x)
+    b = add(square(a), square(a))
+    return add(b, square(exp(square(x))))
+
+
+def eager(data):
+    x = Variable(data)
+    y = model(x)
+    y.backward()
+    return x.grad
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 100, 10000])
+    parser.add_argument('--iters', type=int, default=2000)
+    args = parser.parse_args()
+
+    print('{:>8} {:>16} {:>16}'.format('size', 'eager [us/call]', 'static [us/call]'))
+    for size in args.sizes:
+        data = np.random.rand(size) * 0.5
+        graph = trace(model, data)
+        graph.forward(data)
+        assert np.allclose(graph.backward(), eager(data))
+
+        start = time.perf_counter()
+        for _ in range(args.iters):
+            eager(data)
+        eager_time = (time.perf_counter() - start) / args.iters
+
+        start = time.perf_counter()
+        for _ in range(args.iters):
+            graph.forward(data)
+            graph.backward()
+        static_time = (time.perf_counter() - start) / args.iters
+        print('{:>8} {:>16.2f} {:>16.2f}'.format(size, eager_time * 1e6, static_time * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""DeZeroの自動微分の中核部分のベンチマークスイート。
+
+順伝播と逆伝播の実行時間、その間の最大メモリを、関数ごと・グラフの形ごと・配列の大きさごとに計測し、JSONに書き出す。
+以前の結果を--compareで渡すと比較し、許容幅を超えて遅く(大きく)なった項目があれば終了コード1で終わる。
+
+実行方法:
+    $ python benchmarks/suite.py --output bench.json
+    $ python benchmarks/suite.py --compare bench.json --tolerance 0.2
+"""
+if '__file__' in globals():
+    import os, sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+from dezero import Variable, square, exp, add
+
+
+def case_square(x):
+    return square(x)
+
+
+def case_exp(x):
+    return exp(x)
+
+
+def case_add(x):
+    return add(x, x)
+
+
+def case_composite(x):
+    """steps/step09.pyの合成関数。"""
+    return square(exp(square(x)))
+
+
+def case_deep_chain(x, depth=100):
+    y = x
+    for _ in range(depth):
+        y = square(y)
+    return y
+
+
+def case_wide_fan_out(x, width=100):
+    y = square(x)
+    for _ in range(width - 1):
+        y = add(y, square(x))
+    return y
+
+
+def case_diamond(x):
+    """steps/step16.pyの計算グラフ。"""
+    a = square(x)
+    return add(square(a), square(a))
+
+
+CASES = {
+    'square': case_square,
+    'exp': case_exp,
+    'add': case_add,
+    'composite': case_composite,
+    'deep_chain': case_deep_chain,
+    'wide_fan_out': case_wide_fan_out,
+    'diamond': case_diamond,
+}
+
+METRICS = ('forward_s', 'backward_s', 'peak_bytes')
+
+
+def run_case(fn, size, repeat):
+    """fnの順伝播・逆伝播の最短時間と、1回分の最大メモリを計測する。"""
+    data = np.random.rand(size) * 0.5
+    forward_s = backward_s = float('inf')
+    for _ in range(repeat):
+        x = Variable(data.copy())
+        start = time.perf_counter()
+        y = fn(x)
+        mid = time.perf_counter()
+        y.backward()
+        end = time.perf_counter()
+        forward_s = min(forward_s, mid - start)
+        backward_s = min(backward_s, end - mid)
+
+    x = Variable(data.copy())
+    tracemalloc.start()
+    y = fn(x)
+    y.backward()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'forward_s': forward_s, 'backward_s': backward_s, 'peak_bytes': peak_bytes}
+
+
+def run(cases, sizes, repeat):
+    results = []
+    for name in cases:
+        for size in sizes:
+            result = {'case': name, 'size': size}
+            result.update(run_case(CASES[name], size, repeat))
+            results.append(result)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """baselineより(1 + tolerance)倍を超えて悪化した項目を返す。"""
+    base = {(r['case'], r['size']): r for r in baseline['results']}
+    regressions = []
+    for r in current['results']:
+        b = base.get((r['case'], r['size']))
+        if b is None:
+            continue
+        for metric in METRICS:
+            if b[metric] > 0 and r[metric] > b[metric] * (1 + tolerance):
+                regressions.append((r['case'], r['size'], metric, b[metric], r[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), default=list(CASES))
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 1000, 1000000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='結果を書き出すJSONファイル')
+    parser.add_argument('--compare', help='比較する以前の結果のJSONファイル')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='悪化とみなさない割合')
+    args = parser.parse_args()
+
+    current = run(args.cases, args.sizes, args.repeat)
+
+    print('{:>14} {:>9} {:>12} {:>12} {:>14}'.format('case', 'size', 'forward [s]', 'backward [s]', 'peak [bytes]'))
+    for r in current['results']:
+        print('{:>14} {:>9} {:>12.6f} {:>12.6f} {:>14}'.format(
+            r['case'], r['size'], r['forward_s'], r['backward_s'], r['peak_bytes']))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        for case, size, metric, before, after in regressions:
+            print('REGRESSION {} size={} {}: {:.6g} -> {:.6g}'.format(case, size, metric, before, after))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
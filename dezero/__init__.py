@@ -0,0 +1,20 @@
+from dezero.core_simple import Config
+from dezero.core_simple import using_config
+from dezero.core_simple import no_grad
+from dezero.core_simple import Variable
+from dezero.core_simple import Function
+from dezero.core_simple import BackwardPlan
+from dezero.core_simple import as_array
+from dezero.core_simple import as_variable
+from dezero.core_simple import Square
+from dezero.core_simple import Exp
+from dezero.core_simple import Add
+from dezero.core_simple import Mul
+from dezero.core_simple import SumTo
+from dezero.core_simple import BroadcastTo
+from dezero.core_simple import square
+from dezero.core_simple import exp
+from dezero.core_simple import add
+from dezero.core_simple import mul
+
+import dezero.utils
@@ -0,0 +1,160 @@
+import math
+import numpy as np
+from dezero.core_simple import Function, Variable, using_config, no_grad
+
+
+class Checkpoint(Function):
+    """fnを途中の値を残さずに順伝播し、逆伝播のときにfnの順伝播を計算し直す。
+
+    残すのはfnの入力だけなので、fnの中の途中の値の分だけメモリが減る代わりに、順伝播をもう一度計算する。
+    fnが使う変数のうち、区間の外で関数が出力したものはすべてfnの入力として渡す。
+    逆伝播の中でConfig.enable_backpropを書き換えるので、backward(parallel=True)でも並列には計算しない。
+
+    Attributes:
+        fn (callable): Variableを受け取りVariableを返す関数。
+    """
+    __slots__ = ('fn',)
+    thread_safe = False
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def forward(self, *xs):
+        self.save_for_backward(*xs)
+        with no_grad():
+            y = self.fn(*[Variable(x) for x in xs])
+        return y.data
+
+    def backward(self, gy):
+        xs = [Variable(x) for x in self.saved_tensors]
+        with using_config('enable_backprop', True):  # 呼び出し側の設定によらず、区間の計算グラフを作り直す。
+            y = self.fn(*xs)
+        _check_boundary(y, xs)
+        y.grad = gy
+        y.backward()
+        gxs = tuple(np.zeros_like(x.data) if x.grad is None else x.grad for x in xs)
+        return gxs if len(gxs) > 1 else gxs[0]
+
+    def jvp(self, *txs):
+        xs = [Variable(x) for x in self.saved_tensors]
+        for x, tx in zip(xs, txs):
+            x.tangent = tx
+        with no_grad():
+            y = self.fn(*xs)
+        return y.tangent
+
+
+def _check_boundary(y, xs):
+    """計算し直したyの計算グラフが、xsに依存しない関数の出力(区間の外で計算した変数など)を使っていないか調べる。
+
+    区間の中の逆伝播がそのような変数に届くと、外の計算グラフを先に切ってしまい、外の逆伝播が失敗する。
+    区間の中で作ったのか外で作ったのかは計算グラフからは区別できないので、xsに依存しない関数の出力はどちらも区間の外から渡させる。
+    """
+    funcs = []
+    seen_set = set()
+    stack = [] if y.creator is None else [y.creator]
+    while stack:
+        f = stack.pop()
+        if f not in seen_set and f.inputs is not None:
+            seen_set.add(f)
+            funcs.append(f)
+            stack.extend(x.creator for x in f.inputs if x.creator is not None)
+
+    dependent = set(id(x) for x in xs)  # xsに依存する変数のid。
+    for f in sorted(funcs, key=lambda f: f.generation):  # 世代の小さい順なら、入力の依存を先に決められる。
+        for x in f.inputs:
+            if x.creator is not None and id(x) not in dependent:
+                raise ValueError('checkpointed function uses a variable that does not depend on its inputs; '
+                                 'compute it outside and pass it to checkpoint as an input')
+        if any(id(x) in dependent for x in f.inputs):
+            dependent.update(id(output()) for output in f.outputs)
+    if y.creator is not None and id(y) not in dependent:
+        raise ValueError('checkpointed function returns a variable that does not depend on its inputs')
+
+
+def checkpoint(fn, *xs):
+    """fnの途中の値を残さずにxsから順伝播する。逆伝播ではfnを計算し直す。
+
+    Args:
+        fn (callable): xsと同じ数のVariableを受け取りVariableを返す関数。
+        *xs (Variable): fnへの入力。fnが使う変数のうち、区間の外で関数が出力したものはすべて含める。
+
+    Returns:
+        (Variable): fn(*xs)と同じ値と微分を持つ変数。
+
+    Raises:
+        ValueError: 逆伝播のとき、fnがxsに依存しない関数の出力(xsに含まれない区間の外の変数など)を使った場合。
+
+    Examples:
+        >>> w = square(u)
+        >>> y = checkpoint(lambda v, w: mul(v, w), x, w)
+    """
+    return Checkpoint(fn)(*xs)
+
+
+def segment_size(n, max_activations=None):
+    """n個の関数の連鎖を区間に分けるときの、区間の長さを返す。
+
+    逆伝播中に生きている値は、区間の境目の ceil(n / k) 個と、計算し直している区間の中の k 個なので、k = ceil(√n) で最小の O(√n) になる。
+    区間の長さによらず計算し直すのは順伝播1回分なので、max_activationsに収まる場合は区間に分けない。
+
+    Args:
+        n (int): 連鎖する関数の数。
+        max_activations (NoneType or int): 逆伝播中に生かしておける値の数。Noneなら O(√n) に抑える。
+
+    Returns:
+        (NoneType or int): 区間の長さ。区間に分けずに普通に順伝播すればよい場合はNone。
+
+    Raises:
+        ValueError: 区間に分けてもmax_activationsに収まらない場合。
+    """
+    if max_activations is not None and max_activations >= n:
+        return None
+    k = max(1, math.ceil(math.sqrt(n)))
+    if max_activations is not None and math.ceil(n / k) + k > max_activations:
+        raise ValueError('{} activations are too few for a chain of {} functions (needs {})'.format(
+            max_activations, n, math.ceil(n / k) + k))
+    return k
+
+
+def checkpoint_sequential(functions, x, segment=None, max_bytes=None):
+    """関数の連鎖を区間に分け、区間の境目の値だけを残して順伝播する。
+
+    Args:
+        functions (list): 入力側から順に並べた、Variableを受け取りVariableを返す関数。
+        x (Variable): 最初の関数への入力。
+        segment (NoneType or int): 区間の長さ。Noneならmax_bytesから決める。
+        max_bytes (NoneType or int): 逆伝播中に生かしておける値のバイト数。途中の値はどれもxと同じ大きさとみなす。
+            segmentとともにNoneなら、区間の長さを ceil(√n) にする。
+
+    Returns:
+        (Variable): 最後の関数の出力。
+
+    Raises:
+        ValueError: 区間に分けてもmax_bytesに収まらない場合。
+
+    Examples:
+        >>> y = checkpoint_sequential([square] * 100, x, max_bytes=2 ** 28)
+        >>> y.backward()
+    """
+    n = len(functions)
+    if segment is None:
+        max_activations = None if max_bytes is None else max_bytes // max(x.data.nbytes, 1)
+        segment = segment_size(n, max_activations)
+    if segment is None or segment <= 1:  # 1つずつ区間にしても減る値はない。
+        for f in functions:
+            x = f(x)
+        return x
+
+    for start in range(0, n, segment):
+        x = checkpoint(_chain(functions[start:start + segment]), x)
+    return x
+
+
+def _chain(functions):
+    """functionsを順に適用する関数を返す。"""
+    def fn(x):
+        for f in functions:
+            x = f(x)
+        return x
+    return fn
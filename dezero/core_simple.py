@@ -0,0 +1,741 @@
+import contextlib
+import heapq
+import itertools
+import os
+import weakref
+import numpy as np
+
+
+class Config:
+    """DeZero全体の設定を保持する。
+
+    Attributes:
+        enable_backprop (bool): Trueなら逆伝播のための計算グラフを作る。
+        memory_pool (NoneType or dezero.memory_pool.MemoryPool): 関数の出力と微分値の配列を使い回すプール。
+        num_threads (int): 要素ごとの計算を分けて並列に実行するスレッドの数。1なら分けない。
+        parallel_threshold (int): 要素ごとの計算を分ける最小の要素数。これより小さい配列はスレッドの切り替えの方が高くつく。
+        dtype (NoneType or numpy.dtype): 関数の入出力と微分値の浮動小数点数の型。Noneなら入力の型のまま計算する。
+            np.float32にするとfloat64の半分のメモリで済む。np.float16の微分値はfloat32のバッファに足し込む。
+        cse (NoneType or dezero.cse.CSETable): 同じ関数を同じ入力に適用した呼び出しで、前の出力を使い回す表。
+        forward_cache (NoneType or dezero.forward_cache.ForwardCache): 計算グラフを作らない順伝播の結果を、入力の中身をキーにして取っておくキャッシュ。
+        function_hooks (tuple): 関数の順伝播と逆伝播の前後に呼び出すdezero.function_hooks.FunctionHook。
+    """
+    enable_backprop = True
+    memory_pool = None
+    num_threads = 1
+    parallel_threshold = 2 ** 18
+    dtype = None
+    cse = None
+    forward_cache = None
+    function_hooks = ()
+
+
+@contextlib.contextmanager
+def using_config(name, value):
+    """with文の中だけConfigの設定を変更する。
+
+    Args:
+        name (str): 変更するConfigの属性名。
+        value: 一時的に設定する値。
+    """
+    old_value = getattr(Config, name)
+    setattr(Config, name, value)
+    try:
+        yield
+    finally:
+        setattr(Config, name, old_value)
+
+
+def no_grad():
+    """with文の中では計算グラフを作らず、順伝播だけを行う。"""
+    return using_config('enable_backprop', False)
+
+
+class Variable:
+    """自身のノードの値、一つ前のノードから逆伝播された微分値、自身のノードを生み出した関数、自身のノードの世代を保持する。
+
+    Attributes:
+        data (numpy.ndarray): 格納する変数。
+        grad (NoneType or numpy.ndarray): 逆伝播された微分値。
+        creator (NoneType or Function): 変数を生み出した関数を記憶している変数。
+        generation (Int): 変数の世代を記憶している変数。
+        tangent (NoneType or numpy.ndarray): 前進モードの自動微分で伝える接ベクトル。
+
+    Notes:
+        大量のノードを作っても軽くなるよう、インスタンスごとの__dict__を持たせない。
+        Function.outputsやWeakSetから弱参照できるように__weakref__は残す。
+    """
+    __slots__ = ('data', 'grad', 'creator', 'generation', 'tangent', '__weakref__')
+
+    def __init__(self, data):
+        """
+        Args:
+            data (numpy.ndarray): 格納する変数。
+
+        Raises:
+            TypeError: numpy.ndarray以外の型を引数として受け取った場合。
+        """
+        if data is not None:
+            if not isinstance(data, np.ndarray):
+                raise TypeError('{} is not supported'.format(type(data)))
+
+        self.data = data
+        self.grad = None
+        self.creator = None
+        self.generation = 0
+        self.tangent = None
+
+    def set_creator(self, func):
+        """変数を生み出した関数とその世代をセットする。"""
+        self.creator = func
+        self.generation = func.generation + 1
+
+    def cleargrad(self):
+        """設定した微分値をリセットする。"""
+        self.grad = None
+
+    def backward(self, retain_grad=False, retain_graph=False, plan=None, create_graph=False, parallel=False):
+        """合成関数の逆伝播をループで処理する。
+
+        Args:
+            retain_grad (bool, default False): Falseなら途中の変数の微分値は使い終わった時点で消去し、末端の変数の微分値だけを残す。
+            retain_graph (bool, default False): Falseなら逆伝播が済んだ関数から順に入出力とのつながりを切り、計算グラフを解放する。
+                同じ計算グラフで再度逆伝播する場合はTrueにする。
+            plan (NoneType or BackwardPlan): 同じ形の計算グラフで記録した逆伝播の順番。
+                渡すと計算グラフの順番を調べ直さず、記録した順番で関数の逆伝播を呼び出す。
+            create_graph (bool, default False): Trueなら逆伝播もFunctionのbackward_graphで計算し、微分値を計算グラフを持つVariableにする。
+                微分値からさらに逆伝播すれば高階微分が求まる。微分値の計算グラフは順伝播の計算グラフを参照するので、retain_graphもTrueとして扱う。
+            parallel (bool, default False): Trueなら同じ世代の関数のbackwardをスレッドプールで並列に計算する。
+                微分値の足し込みは呼び出したスレッドで逐次と同じ順番に行うので、結果は逐次と変わらない。
+                create_graphやConfig.memory_pool、Config.function_hooksを使う場合は逐次に計算する。
+
+        Raises:
+            ValueError: planを記録した計算グラフと形が異なる場合。
+
+        Notes:
+            逆伝播する関数は世代をキーにしたヒープで管理するので、グラフのノード数をNとして O(N log N) で処理できる。
+        """
+        if create_graph:
+            retain_graph = True
+        funcs = _backward_order(self) if plan is None else plan.order(self)
+        if self.grad is None:
+            self.grad = np.ones_like(self.data, dtype=Config.dtype)
+        if create_graph:
+            self.grad = as_variable(self.grad)
+
+        hooks = Config.function_hooks
+        computed = {}  # {関数: 並列に計算済みのbackwardの返り値}
+        if parallel and not create_graph and Config.memory_pool is None and not hooks:
+            funcs = _parallel_generations(funcs, computed)
+
+        held = {}  # 計算グラフを切っても、逆伝播が済むまで途中の変数(とその微分値)を生かしておく。
+        owned = weakref.WeakSet()  # この逆伝播で確保した微分値のバッファを持つ変数。インプレースで足し込んでよい。
+
+        with using_config('enable_backprop', Config.enable_backprop or create_graph):  # create_graphなら逆伝播の計算グラフも作る。
+            for f in funcs:  # 1. 変数を生み出した関数を取得する。
+                keep_alive = held.pop(f, None)  # fの出力はこの反復の間だけ生かしておけばよい。
+                gys = [output().grad for output in f.outputs]  # 2. 変数を生み出した関数の出力値を取得する。(output は弱参照)
+                if hooks:
+                    for hook in hooks:
+                        hook.backward_preprocess(f, gys)
+                if f in computed:
+                    gxs = computed.pop(f)
+                elif create_graph:
+                    gxs = f.backward_graph(*[as_variable(gy) for gy in gys])  # 3. 逆伝播をFunctionで計算する。
+                else:
+                    gxs = f.backward(*gys)  # 3. 変数を生み出した関数の逆伝播を呼び出す。
+                if not isinstance(gxs, tuple):
+                    gxs = gxs,
+                if hooks:
+                    for hook in hooks:
+                        hook.backward_postprocess(f, gys, gxs)
+
+                for x, gx in zip(f.inputs, gxs):
+                    if x.grad is None:
+                        x.grad = gx  # 上流のgyと同じ配列の可能性があるので、まだ書き換えてはいけない。
+                    elif create_graph:
+                        x.grad = add(as_variable(x.grad), gx)
+                    elif isinstance(x.grad, Variable):  # create_graphで求めた微分値には値だけを足す。
+                        x.grad = _accumulate(x.grad.data, gx)
+                        owned.add(x)
+                    elif x in owned and x.grad.shape == np.shape(gx) and x.grad.dtype == np.result_type(x.grad, gx):
+                        x.grad += gx  # 自前のバッファにはインプレースで足し込む。
+                    else:
+                        x.grad = _accumulate(x.grad, gx)  # 最初の和で新しいバッファを確保する(copy-on-first-write)。
+                        owned.add(x)
+
+                    if not retain_graph and x.creator is not None:
+                        held.setdefault(x.creator, set()).add(x)
+
+                if not retain_grad:
+                    gys = None  # 使い終わった微分値への参照を手放してから、プールへ戻す。
+                    for y in f.outputs:
+                        gy, y().grad = y().grad, None  # yは弱参照。
+                        if Config.memory_pool is not None:
+                            Config.memory_pool.release(gy)
+                    gy = None
+
+                if not retain_graph:  # 関数と入出力の参照を切り、順伝播で作った配列をGCを待たずに解放できるようにする。
+                    for y in f.outputs:
+                        y().creator = None
+                    f.inputs = None
+                    f.outputs = None
+                    f.saved_tensors = None
+
+
+def _parallel_generations(funcs, computed):
+    """逆伝播する順に並んだfuncsを世代ごとにまとめ、同じ世代の関数のbackwardを並列に計算してcomputedに入れてから返す。
+
+    同じ世代の関数は互いの出力を入力にしないので、その出力の微分値はどれもすでに求まっている。
+    thread_safeでない関数は並列に計算しない。
+    """
+    for _, group in itertools.groupby(funcs, key=lambda f: f.generation):
+        group = list(group)
+        safe = [f for f in group if f.thread_safe]  # thread_safeでない関数は呼び出し側のループで逐次に計算する。
+        if len(safe) > 1:
+            results = _get_executor('backward').map(
+                lambda f: f.backward(*[output().grad for output in f.outputs]), safe)
+            computed.update(zip(safe, results))
+        yield from group
+
+
+def _backward_order(root):
+    """rootから計算グラフをたどり、逆伝播する関数を世代の大きい順に返すジェネレータ。
+
+    関数を返す前にその入力を生み出した関数をヒープへ追加するので、返した関数の計算グラフは呼び出し側で切ってよい。
+    """
+    funcs = []
+    seen_set = set()
+
+    def add_func(f):
+        """逆伝播をする関数を世代の大きい順に取り出せるようにヒープへ追加する。"""
+        if f not in seen_set:
+            # heapqは最小値から取り出すので世代の符号を反転する。同じ世代は追加順で取り出す。
+            heapq.heappush(funcs, (-f.generation, len(seen_set), f))
+            seen_set.add(f)
+
+    if root.creator is not None:
+        add_func(root.creator)
+
+    while funcs:
+        _, _, f = heapq.heappop(funcs)
+        for x in f.inputs:
+            if x.creator is not None:
+                add_func(x.creator)
+        yield f
+
+
+class BackwardPlan:
+    """計算グラフの逆伝播の順番を記録し、同じ形の計算グラフで使い回す。
+
+    毎回同じ形の計算グラフを作り直す学習ループで、ヒープによる順番の決定を最初の1回だけにする。
+    記録するのは関数の型と「何番目の関数の何番目の出力を入力にしたか」だけなので、新しい計算グラフにも使える。
+
+    Attributes:
+        types (list): 逆伝播する順に並べた関数の型。
+        edges (list): 関数ごとの入力の出どころ。入力ごとに(生み出した関数の番号, その関数の出力の番号)、末端の変数ならNone。
+
+    Examples:
+        >>> plan = None
+        >>> for x in batches:
+        ...     y = f(x)
+        ...     if plan is None:
+        ...         plan = BackwardPlan.record(y)
+        ...     y.backward(plan=plan)
+    """
+
+    def __init__(self, types, edges):
+        self.types = types
+        self.edges = edges
+
+    @classmethod
+    def record(cls, y):
+        """yから逆伝播する順番を記録する。yで逆伝播する前に呼び出す。
+
+        Args:
+            y (Variable): 逆伝播を始める変数。
+
+        Returns:
+            (BackwardPlan): 記録した逆伝播の順番。
+        """
+        funcs = list(_backward_order(y))
+        index = {f: i for i, f in enumerate(funcs)}
+        types = [type(f) for f in funcs]
+        edges = []
+        for f in funcs:
+            edge = []
+            for x in f.inputs:
+                if x.creator is None:
+                    edge.append(None)
+                else:
+                    outputs = [output() for output in x.creator.outputs]
+                    k = next(k for k, output in enumerate(outputs) if output is x)
+                    edge.append((index[x.creator], k))
+            edges.append(tuple(edge))
+        return cls(types, edges)
+
+    def order(self, y):
+        """yの計算グラフが記録した形と同じか確かめながら、逆伝播する順に関数を並べる。
+
+        Args:
+            y (Variable): 逆伝播を始める変数。
+
+        Returns:
+            (list): 逆伝播する順に並べた関数。
+
+        Raises:
+            ValueError: 計算グラフの形が記録したものと異なる場合。
+        """
+        funcs = [None] * len(self.types)
+        if funcs:
+            funcs[0] = y.creator
+        elif y.creator is not None:
+            raise ValueError('graph does not match the recorded plan')
+
+        for i, f in enumerate(funcs):
+            edge = self.edges[i]
+            if f is None or type(f) is not self.types[i] or len(f.inputs) != len(edge):
+                raise ValueError('graph does not match the recorded plan at function {}'.format(i))
+            for x, e in zip(f.inputs, edge):
+                if e is None:
+                    if x.creator is not None:
+                        raise ValueError('graph does not match the recorded plan at function {}'.format(i))
+                    continue
+                j, k = e
+                if funcs[j] is None:
+                    funcs[j] = x.creator
+                if x.creator is None or funcs[j] is not x.creator or x.creator.outputs[k]() is not x:
+                    raise ValueError('graph does not match the recorded plan at function {}'.format(i))
+        return funcs
+
+
+def _out(*xs):
+    """xsをブロードキャストして計算するufuncの出力先を返す。
+
+    Config.memory_poolを使う場合はプールから取り出し、使わない場合はNone(ufuncが新しく確保する)を返す。
+    """
+    pool = Config.memory_pool
+    if pool is None:
+        return None
+    return pool.empty(np.broadcast(*xs).shape, np.result_type(*xs))
+
+
+_executors = {}
+
+
+def _get_executor(name):
+    """用途ごとにプロセスで共有するスレッドプールを返す。
+
+    要素ごとの計算('ufunc')と逆伝播('backward')でプールを分け、逆伝播のスレッドが要素ごとの計算を待ってもデッドロックしないようにする。
+    """
+    if name not in _executors:
+        import concurrent.futures  # loggingなども読み込んで重いので、スレッドを使うときまで読み込まない。
+        _executors[name] = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+    return _executors[name]
+
+
+def _ufunc(f, *xs, out=None):
+    """要素ごとに計算するufunc fをxsに適用する。
+
+    Config.num_threadsが2以上で要素数がConfig.parallel_threshold以上なら、連続した区間に分けてスレッドプールで計算する。
+    numpyのufuncは計算中にGILを手放すので、区間ごとの計算が並列に進む。
+    形の違う配列のブロードキャストやC連続でない配列は分けずに計算する。
+
+    Args:
+        f (numpy.ufunc): 要素ごとに計算する関数。
+        *xs (numpy.ndarray or scalar): fへの入力。
+        out (NoneType or numpy.ndarray): 出力先。numpy.ndarrayでなければ(0次元のufuncが返すスカラーなど)_outで決める。
+
+    Returns:
+        (numpy.ndarray): fの出力。
+    """
+    if not isinstance(out, np.ndarray):
+        out = _out(*xs)
+    n = Config.num_threads
+    if n <= 1:  # 既定の1スレッドでは形を調べずにそのまま計算し、小さな配列の呼び出しを遅くしない。
+        return f(*xs, out=out)
+    shape = np.broadcast(*xs).shape
+    if int(np.prod(shape)) < Config.parallel_threshold:
+        return f(*xs, out=out)
+    if not all(np.ndim(x) == 0 or (x.shape == shape and x.flags.c_contiguous) for x in xs):
+        return f(*xs, out=out)
+    if out is None:
+        dtype = f(*[x if np.ndim(x) == 0 else x.reshape(-1)[:1] for x in xs]).dtype  # 型の昇格はfに任せる。
+        out = np.empty(shape, dtype=dtype)
+    elif not out.flags.c_contiguous:
+        return f(*xs, out=out)
+
+    flat_xs = [x if np.ndim(x) == 0 else x.reshape(-1) for x in xs]
+    flat_out = out.reshape(-1)
+    bounds = np.linspace(0, flat_out.size, n + 1).astype(int)
+    futures = [_get_executor('ufunc').submit(f, *[x if np.ndim(x) == 0 else x[start:stop] for x in flat_xs],
+                                             out=flat_out[start:stop])
+               for start, stop in zip(bounds[:-1], bounds[1:])]
+    for future in futures:
+        future.result()  # 区間の計算で起きた例外はここで送出する。
+    return out
+
+
+def sum_to(x, shape):
+    """ブロードキャストで広がったxを、shapeの形になるまで和を取って縮める。
+
+    Args:
+        x (numpy.ndarray): 縮める値。
+        shape (tuple): 縮めた後の形。
+
+    Returns:
+        (numpy.ndarray): 形がshapeの値。
+    """
+    if np.shape(x) == shape:
+        return x
+    lead = np.ndim(x) - len(shape)
+    lead_axis = tuple(range(lead))
+    axis = tuple(i + lead for i, sx in enumerate(shape) if sx == 1)
+    y = np.sum(x, axis=lead_axis + axis, keepdims=True)
+    if lead > 0:
+        y = y.squeeze(lead_axis)
+    return y
+
+
+def as_array(x):
+    """numpy.ndarray以外の型をnumpy.ndarrayに変換する。
+
+    Config.dtypeを設定している場合は、浮動小数点数と整数の値をその型にそろえる。
+    """
+    if not isinstance(x, np.ndarray) and np.isscalar(x):  # 関数の出力はほとんどndarrayなので、先に型だけで判定する。
+        x = np.array(x)
+    return _cast(x)
+
+
+def _cast(x):
+    """Config.dtypeを設定している場合に、数値の配列をその型に変換する。すでに同じ型ならそのまま返す。"""
+    dtype = Config.dtype
+    if dtype is None or x.dtype == dtype or x.dtype.kind not in 'fiu':
+        return x
+    return x.astype(dtype)
+
+
+def _accumulate(a, b):
+    """微分値の和を新しいバッファに求める。float16同士はfloat32で足して丸め誤差の蓄積を抑える。"""
+    dtype = np.result_type(a, b)
+    if dtype == np.float16:
+        dtype = np.float32
+    return np.asarray(np.add(a, b, dtype=dtype))
+
+
+def as_variable(obj):
+    """Variable以外の値をVariableに変換する。"""
+    if isinstance(obj, Variable):
+        return obj
+    return Variable(as_array(obj))
+
+
+def _reduce_to(x, shape):
+    """ブロードキャストで広がったVariableを、SumToでshapeの形に戻す。"""
+    if x.data.shape == shape:
+        return x
+    return SumTo(shape)(x)
+
+
+class Function:
+    """値を受け取って順伝播と逆伝播を計算する。
+
+    Attributes:
+        inputs (tuple): 関数へ入力する値。retain_graph=Falseで逆伝播した後はNone。
+        outputs (list): 関数から出力する値の弱参照。retain_graph=Falseで逆伝播した後はNone。
+        generation (Int): 関数の世代。
+        saved_tensors (tuple): forwardでsave_for_backwardに渡した、逆伝播で使う値。retain_graph=Falseで逆伝播した後はNone。
+        thread_safe (bool): backwardを他の関数のbackwardと並列に呼び出してよいか。
+            backwardの中でConfigを書き換える関数はFalseにし、backward(parallel=True)でも逐次に計算させる。
+
+    Notes:
+        継承する必要あり。サブクラスでも__slots__を定義すると、インスタンスごとの__dict__を持たずに済む。
+    """
+    __slots__ = ('inputs', 'outputs', 'generation', 'saved_tensors', '__weakref__')
+    thread_safe = True
+
+    def __call__(self, *inputs):
+        """
+        Args:
+            *inputs (Variable): 関数へ入力する値が入っているインスタンス。
+
+        Returns:
+            outputs (Variable): 関数の処理結果を入れたインスタンス。
+        """
+        hooks = Config.function_hooks
+        if hooks:
+            for hook in hooks:
+                hook.forward_preprocess(self, inputs)
+
+        cse = Config.cse
+        if cse is not None and all(x.tangent is None for x in inputs):
+            key = cse.key(self, inputs)
+            outputs = cse.lookup(key, inputs, Config.enable_backprop)
+            if outputs is not None:  # 同じ呼び出しの出力があれば順伝播しない。
+                if hooks:
+                    for hook in hooks:
+                        hook.forward_hit(self, inputs, outputs)
+                return outputs if len(outputs) > 1 else outputs[0]
+        else:
+            cse = None
+
+        xs = [x.data for x in inputs]  # Variableからdataを取得する。
+        if Config.dtype is not None:
+            xs = [_cast(x) for x in xs]  # 設定と異なる型の入力は、関数の中で型が広がらないように先にそろえる。
+        self.saved_tensors = ()
+        cache = Config.forward_cache
+        cache_key = None
+        if cache is not None and not Config.enable_backprop and all(x.tangent is None for x in inputs):
+            cache_key = cache.key(self, xs)  # 逆伝播もjvpもしないなら、forwardで保存する値は要らないので結果だけを使い回せる。
+        ys = None if cache_key is None else cache.get(cache_key)
+        hit = ys is not None
+        if not hit:
+            ys = self.forward(*xs)
+            if not isinstance(ys, tuple):  # forwardの返り値がtuple以外ならtupleにする。
+                ys = ys,
+            if cache_key is not None:
+                ys = cache.put(cache_key, ys)
+        outputs = [Variable(as_array(y)) for y in ys]
+
+        txs = [x.tangent for x in inputs]
+        if any(tx is not None for tx in txs):  # 入力に接ベクトルがあれば、出力の接ベクトルも求める(前進モード)。
+            tys = self.jvp(*[0 if tx is None else tx for tx in txs])
+            if not isinstance(tys, tuple):
+                tys = tys,
+            for output, ty in zip(outputs, tys):
+                output.tangent = ty
+
+        if Config.enable_backprop:  # 逆伝播しない場合は入出力を保持せず、計算グラフも作らない。
+            self.generation = max([x.generation for x in inputs])  # 変数の最大の世代を関数の世代とする。
+            for output in outputs:
+                output.set_creator(self)
+            self.inputs = inputs
+            self.outputs = [weakref.ref(output) for output in outputs]  # 循環参照を避けるため出力は弱参照で持つ。
+        else:
+            self.saved_tensors = ()  # 逆伝播しないので保存した値は手放す。
+        if Config.memory_pool is not None:
+            for output in outputs:  # 出力のVariableが消えたら配列をプールへ戻す。
+                Config.memory_pool.track(output)
+        if cse is not None:
+            cse.record(key, self, inputs, outputs, Config.enable_backprop)
+        if hooks:
+            for hook in hooks:
+                if hit:
+                    hook.forward_hit(self, inputs, outputs)
+                else:
+                    hook.forward_postprocess(self, inputs, outputs)
+        return outputs if len(outputs) > 1 else outputs[0]
+
+    def save_for_backward(self, *xs):
+        """forwardの中で呼び出し、逆伝播で使う値だけを保存する。
+
+        保存した値はbackwardとjvpでself.saved_tensorsから取り出す。逆伝播しない場合は呼び出しの最後に手放す。
+
+        Args:
+            *xs (numpy.ndarray): 逆伝播で使う値。
+        """
+        self.saved_tensors = xs
+
+    def forward(self, xs):
+        raise NotImplementedError()
+
+    def backward(self, gys):
+        raise NotImplementedError()
+
+    def backward_graph(self, gys):
+        """backwardと同じ計算をFunctionの組み合わせで行い、Variableを返す。create_graph=Trueの逆伝播で使う。
+
+        入力と出力は保存した値ではなく、self.inputsとself.outputsのVariableを使う。
+        """
+        raise NotImplementedError()
+
+    def jvp(self, txs):
+        """入力の接ベクトルから出力の接ベクトルを求める。前進モードの自動微分で使う。"""
+        raise NotImplementedError()
+
+
+_slot_names = {}  # {関数の型: (Functionの基本の属性以外の__slots__, インスタンスが__dict__を持つか)}
+
+
+def _params(f):
+    """順伝播の前にfに設定されている、Functionの基本の属性以外の属性を返す。"""
+    cls = type(f)
+    entry = _slot_names.get(cls)
+    if entry is None:
+        names = tuple(name for c in cls.__mro__ if c is not Function and c is not object
+                      for name in c.__dict__.get('__slots__', ()))
+        entry = _slot_names[cls] = (names, cls.__dictoffset__ != 0)
+    names, has_dict = entry
+    if not names and not has_dict:  # SquareやExpのように属性を持たない関数。
+        return ()
+    params = [(name, getattr(f, name)) for name in names if hasattr(f, name)]
+    if has_dict:
+        params.extend(sorted(f.__dict__.items()))
+    return tuple(params)
+
+
+class Square(Function):
+    """x ** 2の順伝播と逆伝播をする。"""
+    __slots__ = ()
+
+    def forward(self, x):
+        self.save_for_backward(x)
+        y = _ufunc(np.square, x)
+        return y
+
+    def backward(self, gy):
+        x, = self.saved_tensors
+        gx = _ufunc(np.multiply, x, gy)
+        return _ufunc(np.multiply, gx, 2, out=gx)
+
+    def backward_graph(self, gy):
+        x, = self.inputs
+        t = mul(x, gy)
+        return add(t, t)
+
+    def jvp(self, tx):
+        x, = self.saved_tensors
+        return 2 * x * tx
+
+
+def square(x):
+    return Square()(x)
+
+
+class Exp(Function):
+    """np.exp(x)の順伝播と逆伝播をする。"""
+    __slots__ = ()
+
+    def forward(self, x):
+        y = _ufunc(np.exp, x, out=_out(x, 1.0))  # 整数を入力しても出力は浮動小数点数にする。
+        self.save_for_backward(y)  # exp(x)の微分はexp(x)なので、出力を保存すれば計算し直さずに済む。
+        return y
+
+    def backward(self, gy):
+        y, = self.saved_tensors
+        gx = _ufunc(np.multiply, y, gy)
+        return gx
+
+    def backward_graph(self, gy):
+        y = self.outputs[0]()
+        return mul(y, gy)
+
+    def jvp(self, tx):
+        y, = self.saved_tensors
+        return y * tx
+
+
+def exp(x):
+    return Exp()(x)
+
+
+class Add(Function):
+    """x0 + x1 の順伝播と逆伝播をする。
+
+    Attributes:
+        x0_shape (tuple): x0の形。
+        x1_shape (tuple): x1の形。
+        y_shape (tuple): 出力の形。
+    """
+    __slots__ = ('x0_shape', 'x1_shape', 'y_shape')
+
+    def forward(self, x0, x1):
+        self.x0_shape, self.x1_shape = np.shape(x0), np.shape(x1)
+        y = _ufunc(np.add, x0, x1)
+        self.y_shape = np.shape(y)
+        return y
+
+    def backward(self, gy):
+        gx0, gx1 = gy, gy
+        if self.x0_shape != self.x1_shape:  # ブロードキャストした場合は微分値を入力の形に戻す。
+            gx0 = sum_to(gx0, self.x0_shape)
+            gx1 = sum_to(gx1, self.x1_shape)
+        return gx0, gx1
+
+    def backward_graph(self, gy):
+        return _reduce_to(gy, self.x0_shape), _reduce_to(gy, self.x1_shape)
+
+    def jvp(self, tx0, tx1):
+        return np.broadcast_to(tx0 + tx1, self.y_shape)  # ブロードキャストした入力や接ベクトルのない入力(0)でも出力の形にする。
+
+
+def add(x0, x1):
+    return Add()(x0, x1)
+
+
+class Mul(Function):
+    """x0 * x1 の順伝播と逆伝播をする。"""
+    __slots__ = ()
+
+    def forward(self, x0, x1):
+        self.save_for_backward(x0, x1)
+        y = _ufunc(np.multiply, x0, x1)
+        return y
+
+    def backward(self, gy):
+        x0, x1 = self.saved_tensors
+        return sum_to(gy * x1, np.shape(x0)), sum_to(gy * x0, np.shape(x1))
+
+    def backward_graph(self, gy):
+        x0, x1 = self.inputs
+        return _reduce_to(mul(gy, x1), x0.data.shape), _reduce_to(mul(gy, x0), x1.data.shape)
+
+    def jvp(self, tx0, tx1):
+        x0, x1 = self.saved_tensors
+        return tx0 * x1 + x0 * tx1
+
+
+def mul(x0, x1):
+    return Mul()(x0, x1)
+
+
+class SumTo(Function):
+    """ブロードキャストで広がった値をshapeの形になるまで和を取って縮める。
+
+    Attributes:
+        shape (tuple): 縮めた後の形。
+        x_shape (tuple): 入力の形。
+    """
+    __slots__ = ('shape', 'x_shape')
+
+    def __init__(self, shape):
+        self.shape = shape
+
+    def forward(self, x):
+        self.x_shape = np.shape(x)
+        return sum_to(x, self.shape)
+
+    def backward(self, gy):
+        return np.broadcast_to(gy, self.x_shape)
+
+    def backward_graph(self, gy):
+        return BroadcastTo(self.x_shape)(gy)
+
+    def jvp(self, tx):
+        return sum_to(tx, self.shape)
+
+
+class BroadcastTo(Function):
+    """値をshapeの形にブロードキャストする。
+
+    Attributes:
+        shape (tuple): ブロードキャストした後の形。
+        x_shape (tuple): 入力の形。
+    """
+    __slots__ = ('shape', 'x_shape')
+
+    def __init__(self, shape):
+        self.shape = shape
+
+    def forward(self, x):
+        self.x_shape = np.shape(x)
+        return np.broadcast_to(x, self.shape)
+
+    def backward(self, gy):
+        return sum_to(gy, self.x_shape)
+
+    def backward_graph(self, gy):
+        return _reduce_to(gy, self.x_shape)
+
+    def jvp(self, tx):
+        return np.broadcast_to(tx, self.shape)
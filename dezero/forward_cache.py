@@ -0,0 +1,96 @@
+import collections
+import numpy as np
+from dezero.core_simple import _params
+
+
+class ForwardCache:
+    """計算グラフを作らない順伝播の結果を、関数の型と入力の中身をキーにして取っておく。
+
+    Config.forward_cacheに設定すると、no_gradの中で関数の型、パラメータ、入力の形・型・バイト列のハッシュが同じ呼び出しでは
+    forwardを呼ばずに取っておいた出力を返す。numerical_diffのように同じ小さな入力を何度も評価する場合に効く。
+    取っておく出力の合計がmax_bytesを超えたら、最も長く使われていないものから捨てる。
+    取っておいた出力はハッシュも覚えておくので、連鎖する関数の2つ目からはバイト列をハッシュし直さずに済む。
+
+    Attributes:
+        max_bytes (int): 取っておく出力の合計のバイト数の上限。
+        hits (int): 取っておいた出力を返した回数。
+        misses (int): forwardを呼び出した回数。
+        nbytes (int): いま取っておいている出力の合計のバイト数。
+
+    Examples:
+        >>> with using_config('forward_cache', ForwardCache()), no_grad():
+        ...     y = f(x)
+
+    Notes:
+        キャッシュを通した関数は書き込みできない複製を出力するので、出力の配列をインプレースで書き換えることはできない。
+        ヒットしても入力のハッシュと表の参照の分だけ時間がかかり、要素ごとの安い計算(squareやexp)の連鎖ではキャッシュなしとほぼ同じ速さになる。
+        入力のハッシュより順伝播がずっと重い関数を、同じ入力で繰り返し呼び出す場合に使う。
+    """
+
+    def __init__(self, max_bytes=2 ** 26):
+        """
+        Args:
+            max_bytes (int, default 2 ** 26): 取っておく出力の合計のバイト数の上限。
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = collections.OrderedDict()  # {キー: 出力のtuple} 後ろほど最近使ったもの。
+        self._fingerprints = {}  # {取っておいた出力のid: 指紋} 出力は取っておく間は生きているのでidが変わらない。
+
+    def key(self, f, xs):
+        """fをxsに適用する呼び出しのキーを返す。パラメータがハッシュできなければNoneを返す。"""
+        params = _params(f)
+        try:
+            hash(params)  # 指紋は必ずハッシュできるので、パラメータだけを調べる。
+        except TypeError:
+            return None
+        fingerprints = self._fingerprints
+        return type(f), params, tuple([fingerprints.get(id(x)) or _fingerprint(x) for x in xs])
+
+    def get(self, key):
+        """keyの出力を返す。なければNoneを返す。"""
+        ys = self._entries.get(key)
+        if ys is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return ys
+
+    def put(self, key, ys):
+        """keyの出力を書き込みできない複製にして取っておき、その複製を返す。max_bytesより大きい出力は取っておかずにそのまま返す。"""
+        nbytes = sum(np.asarray(y).nbytes for y in ys)
+        if nbytes > self.max_bytes:
+            return ys
+        ys = tuple(np.array(y) for y in ys)
+        for y in ys:
+            y.flags.writeable = False
+            self._fingerprints[id(y)] = _fingerprint(y)
+        self._discard(self._entries.pop(key, None))
+        self._entries[key] = ys
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self._discard(old)
+        return ys
+
+    def _discard(self, ys):
+        if ys is None:
+            return
+        for y in ys:
+            del self._fingerprints[id(y)]
+        self.nbytes -= sum(y.nbytes for y in ys)
+
+    def clear(self):
+        """取っておいた出力をすべて捨てる。"""
+        self._entries.clear()
+        self._fingerprints.clear()
+        self.nbytes = 0
+
+
+def _fingerprint(x):
+    """配列の形、型、バイト列のハッシュを返す。ハッシュは暗号学的ハッシュより一桁速いPythonのハッシュ(64ビット)を使う。"""
+    x = np.asarray(x)
+    return x.shape, x.dtype.str, hash(x.tobytes())
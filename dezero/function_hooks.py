@@ -0,0 +1,159 @@
+import collections
+import time
+import numpy as np
+from dezero.core_simple import Config, Variable
+
+
+class FunctionHook:
+    """関数の順伝播(Function.__call__)と逆伝播(Function.backward)の前後に呼び出される処理。
+
+    with文で使うと、その中だけConfig.function_hooksに加わる。Config.function_hooksが空なら、呼び出し側はタプルが空か調べるだけで済む。
+    サブクラスで必要なメソッドだけをオーバーライドする。
+
+    Examples:
+        >>> with ProfileHook() as hook:
+        ...     y = f(x)
+        ...     y.backward()
+        >>> hook.print_report()
+    """
+
+    def __enter__(self):
+        Config.function_hooks = Config.function_hooks + (self,)
+        return self
+
+    def __exit__(self, *exc_info):
+        Config.function_hooks = tuple(hook for hook in Config.function_hooks if hook is not self)
+
+    def forward_preprocess(self, f, inputs):
+        """fの順伝播の前に呼び出される。
+
+        Args:
+            f (Function): 順伝播する関数。
+            inputs (tuple): fへ入力するVariable。
+        """
+        pass
+
+    def forward_postprocess(self, f, inputs, outputs):
+        """fの順伝播の後に呼び出される。
+
+        Args:
+            f (Function): 順伝播した関数。
+            inputs (tuple): fへ入力したVariable。
+            outputs (list): fが出力したVariable。
+        """
+        pass
+
+    def forward_hit(self, f, inputs, outputs):
+        """Config.cseやConfig.forward_cacheが前の出力を使い回し、fの順伝播を計算しなかった場合に、forward_postprocessの代わりに呼び出される。
+
+        オーバーライドしなければforward_postprocessを呼び出す。
+
+        Args:
+            f (Function): 呼び出された関数。
+            inputs (tuple): fへ入力したVariable。
+            outputs (list): 使い回した出力のVariable。
+        """
+        self.forward_postprocess(f, inputs, outputs)
+
+    def backward_preprocess(self, f, gys):
+        """fの逆伝播の前に呼び出される。
+
+        Args:
+            f (Function): 逆伝播する関数。
+            gys (list): fの出力の微分値。
+        """
+        pass
+
+    def backward_postprocess(self, f, gys, gxs):
+        """fの逆伝播の後に呼び出される。
+
+        Args:
+            f (Function): 逆伝播した関数。
+            gys (list): fの出力の微分値。
+            gxs (tuple): fの入力の微分値。
+        """
+        pass
+
+
+class ProfileHook(FunctionHook):
+    """関数のクラスごとに、呼び出し回数、順伝播と逆伝播の時間、新しく確保した配列のバイト数を数える。
+
+    時間は入れ子の呼び出し(checkpointの中の関数など)を含む。バイト数は出力した配列のうち、入力をそのまま返したものを除いた合計。
+    Config.cseやConfig.forward_cacheが出力を使い回した呼び出しは、callsとhitsに数え、新しく確保した配列はないものとする。
+
+    Attributes:
+        stats (dict): {関数のクラス名: {'calls', 'hits', 'forward_s', 'backward_s', 'bytes'}}
+    """
+
+    def __init__(self):
+        self.stats = collections.defaultdict(
+            lambda: {'calls': 0, 'hits': 0, 'forward_s': 0.0, 'backward_s': 0.0, 'bytes': 0})
+        # {(関数のid, 'forward' or 'backward'): 開始時刻} 途中で例外が起きて後処理が呼ばれなくても、他の呼び出しの時刻とずれない。
+        self._starts = {}
+
+    def forward_preprocess(self, f, inputs):
+        self._starts[id(f), 'forward'] = time.perf_counter()
+
+    def forward_postprocess(self, f, inputs, outputs):
+        stat = self._forward_stat(f)
+        stat['bytes'] += _new_bytes([y.data for y in outputs], [x.data for x in inputs])
+
+    def forward_hit(self, f, inputs, outputs):
+        stat = self._forward_stat(f)
+        stat['hits'] += 1
+
+    def _forward_stat(self, f):
+        stat = self.stats[type(f).__name__]
+        stat['calls'] += 1
+        stat['forward_s'] += self._elapsed(f, 'forward')
+        return stat
+
+    def backward_preprocess(self, f, gys):
+        self._starts[id(f), 'backward'] = time.perf_counter()
+
+    def backward_postprocess(self, f, gys, gxs):
+        stat = self.stats[type(f).__name__]
+        stat['backward_s'] += self._elapsed(f, 'backward')
+        stat['bytes'] += _new_bytes([_array(gx) for gx in gxs], [_array(gy) for gy in gys])
+
+    def _elapsed(self, f, phase):
+        """前処理からの経過時間を返す。前処理の後にwith文に入った場合など、開始時刻がなければ0とする。"""
+        start = self._starts.pop((id(f), phase), None)
+        return 0.0 if start is None else time.perf_counter() - start
+
+    def summary(self):
+        """関数のクラスごとの集計を、順伝播と逆伝播の時間の合計が大きい順に返す。
+
+        Returns:
+            (list): {'name', 'calls', 'hits', 'forward_s', 'backward_s', 'total_s', 'bytes'}の辞書のリスト。
+        """
+        rows = []
+        for name, stat in self.stats.items():
+            row = dict(name=name, **stat)
+            row['total_s'] = stat['forward_s'] + stat['backward_s']
+            rows.append(row)
+        return sorted(rows, key=lambda row: row['total_s'], reverse=True)
+
+    def print_report(self, file=None):
+        """summaryを表にして出力する。fileがNoneなら標準出力に出力する。"""
+        print('{:<16} {:>8} {:>8} {:>14} {:>14} {:>12} {:>12}'.format(
+            'function', 'calls', 'hits', 'forward [ms]', 'backward [ms]', 'total [ms]', 'bytes'), file=file)
+        for row in self.summary():
+            print('{:<16} {:>8} {:>8} {:>14.3f} {:>14.3f} {:>12.3f} {:>12}'.format(
+                row['name'], row['calls'], row['hits'], row['forward_s'] * 1e3, row['backward_s'] * 1e3,
+                row['total_s'] * 1e3, row['bytes']), file=file)
+
+    def clear(self):
+        """集計を消去する。"""
+        self.stats.clear()
+
+
+def _new_bytes(arrays, sources):
+    """arraysのうち、sourcesのどれかと同じ配列ではないものの合計のバイト数を返す。"""
+    return sum(np.asarray(a).nbytes for a in arrays
+               if a is not None and not any(a is s for s in sources))
+
+
+def _array(x):
+    """create_graphの逆伝播で微分値がVariableの場合は、その値を返す。"""
+    return x.data if isinstance(x, Variable) else x
@@ -0,0 +1,116 @@
+import numpy as np
+from dezero.core_simple import Function, Variable, Square, Exp, using_config
+
+
+# 要素ごとの1入力関数のカーネル。{関数のクラス: (順伝播, 逆伝播)}
+_kernels = {}
+
+
+def register_elementwise(cls, forward, backward):
+    """要素ごとの1入力関数をフュージョンできるように登録する。
+
+    Args:
+        cls (type): Functionのサブクラス。
+        forward (callable): forward(x, out) で cls の順伝播の結果をoutに書き込む関数。
+        backward (callable): backward(x, y, g) で入力x、出力yにおける微分係数をgにインプレースで掛ける関数。
+    """
+    _kernels[cls] = (forward, backward)
+
+
+def _square_backward(x, y, g):
+    g *= x
+    g *= 2
+
+
+register_elementwise(Square, lambda x, out: np.square(x, out=out), _square_backward)
+register_elementwise(Exp, lambda x, out: np.exp(x, out=out), lambda x, y, g: np.multiply(g, y, out=g))
+
+
+class FusedFunction(Function):
+    """要素ごとの1入力関数の連鎖を一つの関数としてまとめて順伝播と逆伝播をする。
+
+    途中の値を変数として残さず、使い回すバッファの上で順に計算する。
+    逆伝播では順伝播を計算し直しながら微分係数をgxに掛けていくので、連鎖の長さによらず一時配列は2つで済む。
+
+    Attributes:
+        classes (tuple): 入力側から順に並べた、まとめる関数のクラス。
+    """
+    __slots__ = ('classes',)
+
+    def __init__(self, classes):
+        """
+        Args:
+            classes (tuple): 入力側から順に並べた、まとめる関数のクラス。
+
+        Raises:
+            ValueError: register_elementwiseで登録されていないクラスが含まれている場合。
+        """
+        for cls in classes:
+            if cls not in _kernels:
+                raise ValueError('{} is not a registered elementwise function'.format(cls.__name__))
+        self.classes = tuple(classes)
+
+    def forward(self, x):
+        self.save_for_backward(x)
+        y = np.empty(x.shape, dtype=np.result_type(x, 1.0))
+        src = x
+        for cls in self.classes:
+            _kernels[cls][0](src, y)  # 2つ目以降はyの上でインプレースに計算する。
+            src = y
+        return y
+
+    def backward(self, gy):
+        x, = self.saved_tensors
+        bufs = [np.empty(x.shape, dtype=np.result_type(x, 1.0)) for _ in range(2)]
+        gx = np.array(gy, dtype=bufs[0].dtype)  # 上流のgyは書き換えない。
+        src = x
+        for i, cls in enumerate(self.classes):
+            forward, backward = _kernels[cls]
+            dst = bufs[i % 2]  # 入力と出力のバッファを交互に使い回す。
+            forward(src, dst)
+            backward(src, dst, gx)
+            src = dst
+        return gx
+
+    def jvp(self, tx):
+        return self.backward(tx)  # 要素ごとの関数なので、接ベクトルにも同じ微分係数を掛ければよい。
+
+
+def fuse(fn):
+    """要素ごとの1入力関数の連鎖で書かれたfnを、一つのFusedFunctionで計算する関数に変換する。
+
+    最初の呼び出しで0次元の値を使ってfnを一度だけ実行し、計算グラフをたどって連鎖を記録する。
+
+    Args:
+        fn (callable): Variableを受け取りVariableを返す関数。例えば lambda x: square(exp(square(x)))
+
+    Returns:
+        (callable): fnと同じ値と微分を返す関数。
+
+    Raises:
+        ValueError: fnが登録済みの要素ごとの1入力関数の一本道の連鎖でない場合。
+    """
+    classes = None
+
+    def fused(x):
+        nonlocal classes
+        if classes is None:
+            classes = _trace(fn, x.data.dtype)
+        return FusedFunction(classes)(x)
+
+    return fused
+
+
+def _trace(fn, dtype):
+    """fnをたどって、入力側から順に並べた関数のクラスを返す。"""
+    x = Variable(np.ones((), dtype=dtype))
+    with using_config('enable_backprop', True):
+        y = fn(x)
+    classes = []
+    while y is not x:
+        f = y.creator
+        if f is None or len(f.inputs) != 1 or len(f.outputs) != 1 or type(f) not in _kernels:
+            raise ValueError('fn is not a chain of registered elementwise functions')
+        classes.append(type(f))
+        y = f.inputs[0]
+    return classes[::-1]
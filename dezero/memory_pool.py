@@ -0,0 +1,104 @@
+import collections
+import sys
+import weakref
+import numpy as np
+
+
+def _refcount(array):
+    return sys.getrefcount(array)
+
+
+def _probe(array):
+    return _refcount(array)
+
+
+def _unreferenced_refcount():
+    """MemoryPool.releaseの中で、呼び出し側のほかに誰も参照していない配列の参照カウントを調べる。"""
+    array = np.empty(0)
+    return _probe(array)
+
+
+class MemoryPool:
+    """形と型ごとに使い終わった配列を取っておき、次に同じ形と型の配列が必要になったときに使い回す。
+
+    取っておく配列の合計がmax_bytesを超えたら、最も長く使われていない形と型の配列から捨てる。
+    Config.memory_poolに設定すると、Square、Exp、Addの出力と微分値をプールから取り、
+    出力を持つVariableが消えたときや、使い終わった途中の微分値を消去したときにプールへ戻す。
+
+    Attributes:
+        max_bytes (int): 取っておく配列の合計のバイト数の上限。
+        hits (int): プールから配列を使い回した回数。
+        misses (int): プールに配列がなく新しく確保した回数。
+        nbytes (int): いま取っておいている配列の合計のバイト数。
+
+    Examples:
+        >>> pool = MemoryPool(max_bytes=2 ** 28)
+        >>> with using_config('memory_pool', pool):
+        ...     train()
+    """
+    # 呼び出し側のほかに参照がない配列の、release内での参照カウント。
+    _UNREFERENCED = None
+
+    def __init__(self, max_bytes=2 ** 30):
+        """
+        Args:
+            max_bytes (int, default 2 ** 30): 取っておく配列の合計のバイト数の上限。
+        """
+        if MemoryPool._UNREFERENCED is None:
+            MemoryPool._UNREFERENCED = _unreferenced_refcount()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._arrays = collections.OrderedDict()  # {(形, 型): [配列, ...]} 後ろほど最近使った形と型。
+        self._tracked = {}  # {Variableの弱参照: そのdata}
+        self._pending = []  # 消えたVariableのdata。次にemptyを呼んだときにプールへ戻す。
+
+    def empty(self, shape, dtype):
+        """形と型が同じ配列をプールから取り出す。なければ新しく確保する。中身は初期化しない。"""
+        while self._pending:
+            array = self._pending.pop()
+            self.release(array)
+        key = (tuple(shape), np.dtype(dtype))
+        arrays = self._arrays.get(key)
+        if arrays:
+            self._arrays.move_to_end(key)
+            array = arrays.pop()
+            self.nbytes -= array.nbytes
+            self.hits += 1
+            return array
+        self.misses += 1
+        return np.empty(shape, dtype=dtype)
+
+    def release(self, array):
+        """使い終わった配列をプールへ戻す。呼び出し側はこの後arrayを使ってはいけない。
+
+        呼び出し側のほかに参照されている配列(ビューの元の配列、save_for_backwardで保存された値など)は、書き換えると壊れるので戻さない。
+        """
+        if not isinstance(array, np.ndarray) or array.base is not None or not array.flags.writeable:
+            return
+        if _refcount(array) > self._UNREFERENCED:
+            return
+        key = (array.shape, array.dtype)
+        self._arrays.setdefault(key, []).append(array)
+        self._arrays.move_to_end(key)
+        self.nbytes += array.nbytes
+        while self.nbytes > self.max_bytes:
+            _, arrays = next(iter(self._arrays.items()))
+            self.nbytes -= arrays.pop(0).nbytes
+            if not arrays:
+                self._arrays.popitem(last=False)
+
+    def track(self, variable):
+        """variableが消えたら、そのdataをプールへ戻す。"""
+        self._tracked[weakref.ref(variable, self._on_delete)] = variable.data
+
+    def _on_delete(self, ref):
+        # 弱参照のコールバックの時点では、消えかけのVariableがまだdataを参照しているので、後でプールへ戻す。
+        self._pending.append(self._tracked.pop(ref))
+
+    def clear(self):
+        """取っておいた配列をすべて捨てる。"""
+        self._arrays.clear()
+        self._pending.clear()
+        self.nbytes = 0
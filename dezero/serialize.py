@@ -0,0 +1,292 @@
+import importlib
+import inspect
+import json
+import struct
+import numpy as np
+from dezero.core_simple import Function, Variable, as_variable
+
+
+MAGIC = b'DZGRAPH\x01'
+_ALIGN = 64  # 配列のブロックを置く境界。メモリマップしたときにSIMDの整列を崩さない。
+
+
+def save_graph(path, outputs, inputs=(), save_data=True):
+    """outputsまでの計算グラフを、関数の型・世代・つながりと配列を並べた1つのバイナリファイルに書き出す。
+
+    ファイルは先頭のマジックナンバーとヘッダの位置のあとに、.npy形式の配列のブロックを並べ、最後にJSONのヘッダを置く。
+    つながりは整数の配列のブロックに入れるので、関数の数が多くてもヘッダは大きくならない。
+    ヘッダには各ブロックの値の先頭の位置も書くので、読み込むときに.npyのヘッダを解析し直さずに済む。
+
+    Args:
+        path (str): 書き出すファイルのパス。
+        outputs (Variable or list): 計算グラフの出力。逆伝播で計算グラフを切る前に呼び出す。
+        inputs (list): 読み込んだ後に値を差し替えて実行する末端の変数。それ以外の末端の変数は定数として値を書き出す。
+        save_data (bool, default True): Trueならinputsの値も書き出し、読み込んだ後に引数なしで実行できるようにする。
+
+    Raises:
+        ValueError: inputsが末端の変数でない場合、逆伝播で計算グラフが切られている場合、関数の__init__の引数がJSONで表せない場合。
+    """
+    if isinstance(outputs, Variable):
+        outputs = [outputs]
+    funcs = _collect(outputs, inputs)
+
+    index = {}
+    variables = []
+
+    def var(v):
+        if v is None:  # 誰も参照しなくなった出力。
+            return -1
+        if v not in index:
+            index[v] = len(variables)
+            variables.append(v)
+        return index[v]
+
+    for x in inputs:
+        if x.creator is not None:
+            raise ValueError('inputs must be leaf variables')
+        var(x)
+    types, type_index = [], {}
+    rows, params = [], {}
+    in_ptr, in_idx, out_ptr, out_idx = [0], [], [0], []
+    for i, f in enumerate(funcs):
+        cls = type(f)
+        if cls not in type_index:
+            type_index[cls] = len(types)
+            types.append('{}:{}'.format(cls.__module__, cls.__qualname__))
+        rows.append((type_index[cls], f.generation))
+        p = _init_params(f)
+        if p:
+            params[str(i)] = p
+        in_idx.extend(var(x) for x in f.inputs)
+        in_ptr.append(len(in_idx))
+        out_idx.extend(var(y()) for y in f.outputs)
+        out_ptr.append(len(out_idx))
+    output_index = [var(y) for y in outputs]
+
+    input_set = set(index[x] for x in inputs)
+    with open(path, 'wb') as fp:
+        fp.write(MAGIC)
+        fp.write(struct.pack('<Q', 0))  # ヘッダの位置はブロックを書いた後に埋める。
+
+        def block(array):
+            """arrayを.npy形式で書き込み、値の先頭の位置を返す。"""
+            array = np.ascontiguousarray(array)
+            _pad(fp)
+            np.lib.format.write_array(fp, array, allow_pickle=False)
+            return fp.tell() - array.nbytes
+
+        topology = {}
+        for name, a in (('functions', rows), ('in_ptr', in_ptr), ('in_idx', in_idx),
+                        ('out_ptr', out_ptr), ('out_idx', out_idx)):
+            a = np.array(a, dtype=np.int64).reshape(-1)
+            topology[name] = [block(a), a.size]
+        metas = []
+        for i, v in enumerate(variables):
+            stored = v.creator is None and (save_data or i not in input_set)
+            metas.append([list(v.data.shape), v.data.dtype.str, block(v.data) if stored else -1])
+
+        header = json.dumps({
+            'types': types,
+            'params': params,
+            'variables': metas,
+            'inputs': [index[x] for x in inputs],
+            'outputs': output_index,
+            'topology': topology,
+        }, separators=(',', ':')).encode('utf-8')
+        header_offset = fp.tell()
+        fp.write(header)
+        fp.seek(len(MAGIC))
+        fp.write(struct.pack('<Q', header_offset))
+
+
+def load_graph(path, mmap=True):
+    """save_graphで書き出したファイルを読み込む。
+
+    信頼できるファイルだけを読み込むこと。関数の型はヘッダに書かれたモジュールをimportして取り出す。
+
+    Args:
+        path (str): 読み込むファイルのパス。
+        mmap (bool, default True): Trueなら配列のブロックを読み取り専用でメモリマップし、ファイル全体を読み込まない。
+
+    Returns:
+        (GraphFile): 読み込んだ計算グラフ。
+
+    Raises:
+        ValueError: save_graphで書き出したファイルでない場合。
+    """
+    with open(path, 'rb') as fp:
+        if fp.read(len(MAGIC)) != MAGIC:
+            raise ValueError('{} is not a dezero graph file'.format(path))
+        header_offset, = struct.unpack('<Q', fp.read(8))
+        fp.seek(header_offset)
+        header = json.loads(fp.read().decode('utf-8'))
+        whole = np.memmap(path, dtype=np.uint8, mode='r') if mmap else None  # ブロックはこの1つのマップのビューにする。
+
+        def block(offset, shape, dtype):
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape))
+            if whole is not None:
+                return whole[offset:offset + count * dtype.itemsize].view(dtype).reshape(shape)
+            fp.seek(offset)
+            return np.fromfile(fp, dtype=dtype, count=count).reshape(shape)
+
+        topology = {name: np.asarray(block(offset, (size,), np.int64))
+                    for name, (offset, size) in header['topology'].items()}
+        data = {i: block(offset, tuple(shape), dtype)
+                for i, (shape, dtype, offset) in enumerate(header['variables']) if offset >= 0}
+
+    types = [_import(name) for name in header['types']]
+    functions = []
+    in_ptr, in_idx, out_ptr, out_idx = [topology[name].tolist() for name in ('in_ptr', 'in_idx', 'out_ptr', 'out_idx')]
+    for i, (t, generation) in enumerate(topology['functions'].reshape(-1, 2).tolist()):
+        params = {k: _from_json(v) for k, v in header['params'].get(str(i), {}).items()}
+        functions.append((types[t], params, generation,
+                          tuple(in_idx[in_ptr[i]:in_ptr[i + 1]]), tuple(out_idx[out_ptr[i]:out_ptr[i + 1]])))
+    return GraphFile(functions, [(tuple(s), np.dtype(d)) for s, d, _ in header['variables']],
+                     data, header['inputs'], header['outputs'])
+
+
+class GraphFile:
+    """load_graphで読み込んだ計算グラフ。Pythonのモデルのコードを呼ばずに、記録した関数を順に実行する。
+
+    Attributes:
+        functions (list): 順伝播する順に並べた(関数の型, __init__の引数, 世代, 入力の番号, 出力の番号)。出力の番号が-1なら捨てる。
+        variables (list): 変数ごとの(形, 型)。
+        data (dict): {変数の番号: 書き出した値}。メモリマップした読み取り専用の配列。
+        inputs (list): 実行するときに値を渡す変数の番号。
+        outputs (list): 出力の変数の番号。
+    """
+
+    def __init__(self, functions, variables, data, inputs, outputs):
+        self.functions = functions
+        self.variables = variables
+        self.data = data
+        self.inputs = inputs
+        self.outputs = outputs
+
+    def run(self, *xs):
+        """記録した関数を順に呼び出して計算グラフを作り直し、出力を返す。出力から逆伝播もできる。
+
+        Args:
+            *xs (Variable or numpy.ndarray): inputsに渡す値。省略するとファイルに書き出した値を使う。
+
+        Returns:
+            (Variable or tuple): 出力。
+
+        Raises:
+            ValueError: 値の数がinputsと合わない場合や、値を省略したのにファイルに値がない場合。
+        """
+        if not xs:
+            missing = [i for i in self.inputs if i not in self.data]
+            if missing:
+                raise ValueError('the file has no data for inputs {}'.format(missing))
+            xs = [self.data[i] for i in self.inputs]
+        if len(xs) != len(self.inputs):
+            raise ValueError('expected {} inputs, got {}'.format(len(self.inputs), len(xs)))
+
+        values = [None] * len(self.variables)
+        for i, array in self.data.items():
+            values[i] = Variable(array)
+        for i, x in zip(self.inputs, xs):
+            values[i] = as_variable(x)
+        for cls, params, _, in_idx, out_idx in self.functions:
+            ys = cls(**params)(*[values[j] for j in in_idx])
+            if not isinstance(ys, (tuple, list)):
+                ys = ys,
+            for j, y in zip(out_idx, ys):
+                if j >= 0:
+                    values[j] = y
+        outputs = tuple(values[i] for i in self.outputs)
+        return outputs if len(outputs) > 1 else outputs[0]
+
+    def compile(self, *xs):
+        """dezero.static.traceでStaticGraphに変換し、VariableやFunctionを作らずに繰り返し実行できるようにする。
+
+        Args:
+            *xs (numpy.ndarray): トレースに使う入力。省略するとファイルに書き出した値を使う。
+
+        Returns:
+            (dezero.static.StaticGraph): 変換した計算グラフ。
+        """
+        from dezero.static import trace
+        if not xs:
+            xs = [np.array(self.data[i]) for i in self.inputs]
+        return trace(self.run, *xs)
+
+
+def _collect(outputs, inputs):
+    """outputsまでの関数を、世代の小さい順(順伝播できる順)に並べて返す。
+
+    逆伝播で計算グラフを切った変数は、関数が出力したのに(世代が1以上なのに)creatorがNoneになる。
+    そのような変数をinputsでもないのに末端として書き出すと、古い値を定数とするグラフになるので送出する。
+    """
+    input_ids = set(id(x) for x in inputs)
+
+    def check(v):
+        if v.creator is None and v.generation > 0 and id(v) not in input_ids:
+            raise ValueError('the graph has been freed by backward; save it before backward or use retain_graph=True')
+
+    funcs = []
+    seen_set = set()
+    for y in outputs:
+        check(y)
+    stack = [y.creator for y in outputs if y.creator is not None]
+    while stack:
+        f = stack.pop()
+        if f not in seen_set:
+            if f.inputs is None:
+                raise ValueError('the graph has been freed by backward; save it before backward or use retain_graph=True')
+            seen_set.add(f)
+            funcs.append(f)
+            for x in f.inputs:
+                check(x)
+            stack.extend(x.creator for x in f.inputs if x.creator is not None)
+    funcs.sort(key=lambda f: f.generation)  # 同じ世代の関数は互いに独立なので、世代の小さい順に並べれば順伝播できる。
+    return funcs
+
+
+def _init_params(f):
+    """fの__init__の引数と同じ名前の属性を、JSONで表せる形で返す。"""
+    init = type(f).__init__
+    if init is object.__init__:
+        return {}
+    params = {}
+    for name in list(inspect.signature(init).parameters)[1:]:
+        value = _to_json(getattr(f, name))
+        try:
+            json.dumps(value)
+        except TypeError:
+            raise ValueError('cannot serialize parameter {!r} of {}'.format(name, type(f).__name__)) from None
+        params[name] = value
+    return params
+
+
+def _to_json(value):
+    # tupleはJSONではリストになるので、印を付けて読み込むときに戻す。
+    if isinstance(value, tuple):
+        return {'tuple': [_to_json(v) for v in value]}
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+def _from_json(value):
+    if isinstance(value, dict) and list(value) == ['tuple']:
+        return tuple(_from_json(v) for v in value['tuple'])
+    return value
+
+
+def _import(name):
+    """'モジュール:クラス'の形の名前からFunctionのサブクラスを取り出す。"""
+    module, qualname = name.split(':')
+    obj = importlib.import_module(module)
+    for attr in qualname.split('.'):
+        obj = getattr(obj, attr)
+    if not (isinstance(obj, type) and issubclass(obj, Function)):
+        raise ValueError('{} is not a Function'.format(name))
+    return obj
+
+
+def _pad(fp):
+    """次に書き込む位置を_ALIGNの倍数にそろえる。"""
+    fp.write(b'\0' * (-fp.tell() % _ALIGN))
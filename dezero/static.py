@@ -0,0 +1,185 @@
+import numpy as np
+from dezero.core_simple import Variable, Square, Exp, Add, sum_to, using_config
+
+
+# 出力先のバッファに書き込む順伝播のカーネル。forward(xs, ys)
+_forward_kernels = {
+    Square: lambda xs, ys: np.square(xs[0], out=ys[0]),
+    Exp: lambda xs, ys: np.exp(xs[0], out=ys[0]),
+    Add: lambda xs, ys: np.add(xs[0], xs[1], out=ys[0]),
+}
+
+
+def _square_backward(xs, ys, gys, gxs, tmp):
+    np.multiply(xs[0], gys[0], out=tmp)
+    tmp *= 2
+    gxs[0] += tmp
+
+
+def _exp_backward(xs, ys, gys, gxs, tmp):
+    np.multiply(ys[0], gys[0], out=tmp)
+    gxs[0] += tmp
+
+
+def _add_backward(xs, ys, gys, gxs, tmp):
+    gxs[0] += gys[0]
+    gxs[1] += gys[0]
+
+
+# 入力の微分値のバッファに足し込む逆伝播のカーネル。backward(xs, ys, gys, gxs, tmp)
+_backward_kernels = {
+    Square: _square_backward,
+    Exp: _exp_backward,
+    Add: _add_backward,
+}
+
+
+class StaticGraph:
+    """traceで一度だけ実行した計算グラフを、VariableやFunctionを作らずに繰り返し実行する。
+
+    値と微分値はそれぞれ確保済みのバッファの表に置き、順伝播と逆伝播は(関数, 入力の番号, 出力の番号)の平坦な命令列として実行する。
+    Square、Exp、Add(ブロードキャストしない場合)はバッファへ直接書き込むカーネルで計算する。
+    それ以外の関数はトレースしたときのインスタンスのforward/backwardを呼ぶので、逆伝播で使う値はsave_for_backwardで保存している必要がある。
+
+    Attributes:
+        buffers (list): 値のバッファの表。先頭からn_inputs個が入力の値。
+        grads (list): buffersと同じ並びの微分値のバッファの表。値が整数の場合も浮動小数点数で持つ。
+        code (list): 順伝播する順に並べた(関数, 順伝播のカーネル, 逆伝播のカーネル, 入力の番号のtuple, 出力の番号のtuple)。
+            カーネルがNoneなら関数のforward/backwardを呼ぶ。
+        output_slots (tuple): 出力の値の番号。
+        n_inputs (int): 入力の数。
+
+    Notes:
+        forwardとbackwardが返す配列はバッファそのもので、次の呼び出しで上書きされる。残す場合はコピーする。
+    """
+
+    def __init__(self, buffers, code, output_slots, n_inputs):
+        self.buffers = buffers
+        self.grads = [np.zeros_like(b, dtype=np.result_type(b, 1.0)) for b in buffers]  # 整数の値でも微分値は浮動小数点数にする。
+        self.code = code
+        self.output_slots = output_slots
+        self.n_inputs = n_inputs
+
+        # 命令ごとに使うバッファを前もって引いておき、実行時は表を引かずに済ませる。
+        scratch = {}  # 逆伝播の途中の値を入れる、形と型ごとに1つの作業用バッファ。
+        self._instructions = []
+        for f, forward, backward, in_slots, out_slots in code:
+            xs = [buffers[i] for i in in_slots]
+            g = self.grads[in_slots[0]]
+            tmp = scratch.setdefault((g.shape, g.dtype), np.empty_like(g)) if backward else None
+            self._instructions.append((f, forward, backward, xs, [buffers[i] for i in out_slots],
+                                       [self.grads[i] for i in in_slots], [self.grads[i] for i in out_slots], tmp))
+
+    def forward(self, *xs):
+        """
+        Args:
+            *xs (numpy.ndarray): トレースしたときと同じ形の入力。値はバッファへコピーする。
+
+        Returns:
+            (numpy.ndarray or tuple): 出力の値。
+
+        Raises:
+            ValueError: 入力の数や形がトレースしたときと異なる場合。
+        """
+        if len(xs) != self.n_inputs:
+            raise ValueError('expected {} inputs, got {}'.format(self.n_inputs, len(xs)))
+        buffers = self.buffers
+        for i, x in enumerate(xs):
+            if np.shape(x) != buffers[i].shape:
+                raise ValueError('input {} must have shape {}'.format(i, buffers[i].shape))
+            np.copyto(buffers[i], x)
+
+        for f, forward, _, inputs, outputs, _, _, _ in self._instructions:
+            if forward is not None:
+                forward(inputs, outputs)
+            else:
+                ys = f.forward(*inputs)
+                if not isinstance(ys, tuple):
+                    ys = ys,
+                for out, y in zip(outputs, ys):
+                    np.copyto(out, y)
+        outputs = tuple(buffers[i] for i in self.output_slots)
+        return outputs if len(outputs) > 1 else outputs[0]
+
+    def backward(self, *gys):
+        """直前のforwardについて逆伝播する。
+
+        Args:
+            *gys (numpy.ndarray): 出力の微分値。省略すると1とする。
+
+        Returns:
+            (numpy.ndarray or tuple): 入力の微分値。
+        """
+        grads = self.grads
+        for g in grads:
+            g.fill(0)
+        for k, i in enumerate(self.output_slots):
+            grads[i] += gys[k] if gys else 1
+
+        for f, _, backward, inputs, outputs, gxs, out_gys, tmp in reversed(self._instructions):
+            if backward is not None:
+                backward(inputs, outputs, out_gys, gxs, tmp)
+            else:
+                local = f.backward(*out_gys)
+                if not isinstance(local, tuple):
+                    local = local,
+                for g, gx in zip(gxs, local):
+                    g += sum_to(gx, g.shape)
+        gxs = tuple(grads[:self.n_inputs])
+        return gxs if len(gxs) > 1 else gxs[0]
+
+
+def trace(fn, *xs):
+    """fnを一度だけ実行して計算グラフを記録し、StaticGraphに変換する。
+
+    Args:
+        fn (callable): Variableを受け取り、Variableかそのtupleを返する関数。
+        *xs (numpy.ndarray): トレースに使う入力。変換後はこれと同じ形の入力を受け付ける。
+
+    Returns:
+        (StaticGraph): 変換した計算グラフ。
+    """
+    inputs = [Variable(x) for x in xs]
+    with using_config('enable_backprop', True):
+        outputs = fn(*inputs)
+    if not isinstance(outputs, tuple):
+        outputs = outputs,
+
+    funcs = []
+    seen_set = set()
+    stack = [y.creator for y in outputs if y.creator is not None]
+    while stack:
+        f = stack.pop()
+        if f not in seen_set:
+            seen_set.add(f)
+            funcs.append(f)
+            stack.extend(x.creator for x in f.inputs if x.creator is not None)
+    funcs.sort(key=lambda f: f.generation)  # 同じ世代の関数は互いに独立なので、世代の小さい順に並べれば順伝播できる。
+
+    slots = {}
+    buffers = []
+
+    def slot(v):
+        if id(v) not in slots:
+            slots[id(v)] = len(buffers)
+            buffers.append(np.array(v.data))
+        return slots[id(v)]
+
+    for x in inputs:
+        slot(x)
+    code = []
+    for f in funcs:
+        ys = [output() for output in f.outputs]
+        in_slots = tuple(slot(x) for x in f.inputs)
+        out_slots = tuple(slot(y) for y in ys)
+        forward = _forward_kernels.get(type(f))
+        backward = _backward_kernels.get(type(f))
+        if any(x.data.shape != ys[0].data.shape for x in f.inputs):
+            forward = backward = None  # ブロードキャストする場合はカーネルを使わない。
+        code.append((f, forward, backward, in_slots, out_slots))
+
+    output_slots = tuple(slot(y) for y in outputs)
+    for f in funcs:  # トレースに使ったVariableへの参照を切る。
+        f.inputs = None
+        f.outputs = None
+    return StaticGraph(buffers, code, output_slots, len(inputs))
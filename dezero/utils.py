@@ -0,0 +1,180 @@
+import numpy as np
+from dezero.core_simple import Variable, as_array, sum_to, using_config, no_grad
+
+
+def numerical_diff(f, x, eps=1e-4):
+    """xの全要素を同じepsだけずらして中心差分を取る。
+
+    Args:
+        f (callable): 数値微分する関数。
+        x (Variable): 数値微分する値。
+        eps (float, default 1e-4): 微小な値。
+
+    Returns:
+        (numpy.ndarray): 数値微分の結果。
+    """
+    x0 = Variable(as_array(x.data - eps))
+    x1 = Variable(as_array(x.data + eps))
+    with no_grad():  # 値しか使わないので計算グラフは作らない。Config.forward_cacheも効く。
+        y0 = f(x0)
+        y1 = f(x1)
+    return (y1.data - y0.data) / (2 * eps)
+
+
+def _central_differences(f, x, eps, max_elements):
+    """xの要素を1つずつ±epsだけずらした入力を先頭の軸に積み重ね、まとめてfに通す。
+
+    メモリを抑えるため、積み重ねた入力の要素数がmax_elementsを超えないように要素をいくつかのチャンクに分ける。
+
+    Yields:
+        (slice, numpy.ndarray): ずらした要素の(平坦化した)インデックスと、各要素についての f(x+eps) - f(x-eps) (チャンク, *出力の形)。
+            2 * epsで割るのは呼び出し側で行う。
+    """
+    data = x.data
+    n = data.size
+    chunk = max(1, max_elements // (2 * max(n, 1)))
+    flat = data.reshape(-1)
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        c = stop - start
+        xs = np.empty((2 * c, n), dtype=np.result_type(data, 1.0))
+        xs[...] = flat  # 前半c行は+eps、後半c行は-epsだけずらす。
+        rows = np.arange(c)
+        xs[rows, start + rows] += eps
+        xs[c + rows, start + rows] -= eps
+        with using_config('enable_backprop', False):
+            ys = f(Variable(xs.reshape((2 * c,) + data.shape))).data
+        yield slice(start, stop), ys[:c] - ys[c:]  # Config.forward_cacheの出力は書き込みできないので、新しい配列に求める。
+
+
+def numerical_grad(f, x, eps=1e-4, max_elements=2 ** 16):
+    """fの出力の総和に対するxの勾配を、全要素を一度にずらした1回の順伝播で数値的に求める。
+
+    Variable.backwardが出力の微分値を1で初期化するのに合わせ、出力の総和を微分する。
+
+    Args:
+        f (callable): 数値微分する関数。先頭の軸をバッチとして、行ごとに独立に計算できる必要がある。
+        x (Variable): 数値微分する値。
+        eps (float, default 1e-4): 微小な値。
+        max_elements (int, default 2 ** 16): 一度の順伝播に積み重ねる入力の要素数の上限。
+
+    Returns:
+        (numpy.ndarray): xと同じ形の勾配。
+    """
+    grad = np.empty(x.data.size, dtype=np.result_type(x.data, 1.0))
+    for index, diff in _central_differences(f, x, eps, max_elements):
+        grad[index] = diff.reshape(diff.shape[0], -1).sum(axis=1)
+    grad /= 2 * eps
+    return grad.reshape(x.data.shape)
+
+
+def numerical_jacobian(f, x, eps=1e-4, max_elements=2 ** 16):
+    """fのヤコビ行列を、全要素を一度にずらした1回の順伝播で数値的に求める。
+
+    Args:
+        f (callable): 数値微分する関数。先頭の軸をバッチとして、行ごとに独立に計算できる必要がある。
+        x (Variable): 数値微分する値。
+        eps (float, default 1e-4): 微小な値。
+        max_elements (int, default 2 ** 16): 一度の順伝播に積み重ねる入力の要素数の上限。
+
+    Returns:
+        (numpy.ndarray): 形が(*出力の形, *xの形)のヤコビ行列。
+    """
+    columns = []
+    for _, diff in _central_differences(f, x, eps, max_elements):
+        columns.append(diff.reshape(diff.shape[0], -1))
+        out_shape = diff.shape[1:]
+    jacobian = np.concatenate(columns).T / (2 * eps)  # (出力の要素数, 入力の要素数)
+    return jacobian.reshape(out_shape + x.data.shape)
+
+
+def jvp(f, xs, vs):
+    """前進モードの自動微分で、fのヤコビ行列とベクトルvsの積を1回の順伝播で求める。
+
+    入力が少なく出力が多い関数では、出力の数だけ逆伝播するよりも速い。
+
+    Args:
+        f (callable): 微分する関数。
+        xs (list): fへ入力するVariable。
+        vs (list): xsと同じ形の接ベクトル(numpy.ndarray)。
+
+    Returns:
+        (tuple): fの出力の値と、その接ベクトル。fの出力が複数ならそれぞれtuple。
+    """
+    inputs = []
+    for x, v in zip(xs, vs):
+        x = Variable(x.data)  # 呼び出し側のVariableには接ベクトルを付けない。
+        x.tangent = v
+        inputs.append(x)
+    with no_grad():
+        ys = f(*inputs)
+    if isinstance(ys, tuple):
+        return tuple(y.data for y in ys), tuple(y.tangent for y in ys)
+    return ys.data, ys.tangent
+
+
+def hvp(f, x, v):
+    """fの出力の総和のヘッセ行列とベクトルvの積を求める。
+
+    create_graph=Trueの逆伝播で微分値の計算グラフを作り、それをvから逆伝播する。数値微分とは違い、逆伝播1回分で厳密に求まる。
+
+    Args:
+        f (callable): 微分する関数。
+        x (Variable): 微分する値。
+        v (numpy.ndarray): xと同じ形のベクトル。
+
+    Returns:
+        (numpy.ndarray): xと同じ形のヘッセ行列とベクトルの積。
+    """
+    x = Variable(x.data)  # 呼び出し側のVariableの微分値は書き換えない。
+    y = f(x)
+    y.backward(create_graph=True)
+    gx = x.grad
+    x.cleargrad()
+    if gx is not None:
+        gx.grad = v
+        gx.backward()
+    if x.grad is None:  # 微分値がxに依存しない(fがxの1次式など)場合、ヘッセ行列は0になる。
+        return np.zeros_like(x.data)
+    return x.grad
+
+
+def vmap_grad(f, xs, in_axes=None):
+    """先頭の軸に積み重ねたサンプルごとに、fの出力の総和の微分値を1回の順伝播と逆伝播で求める。
+
+    サンプルごとにVariableを作って逆伝播する代わりに、積み重ねた値のままfを計算する。
+    バッチで共有する入力はサンプルの数だけブロードキャストした末端の変数にするので、その微分値もサンプルごとに分かれる。
+    fはサンプル1つ分の形で書き、先頭の軸をまたぐ計算(SumToで先頭の軸を縮めるなど)をしてはいけない。
+
+    Args:
+        f (callable): サンプル1つ分の値を受け取って微分する関数。
+        xs (list): fへ入力するVariable。
+        in_axes (NoneType or list): xsごとに、先頭の軸にサンプルを積み重ねていれば0、バッチで共有するならNone。
+            Noneならすべて0とみなす。
+
+    Returns:
+        (tuple): xsごとの、先頭の軸がサンプルの数の微分値。
+
+    Raises:
+        ValueError: 積み重ねた入力がない場合や、0以外のin_axesを渡した場合、積み重ねた数がそろっていない場合。
+    """
+    if in_axes is None:
+        in_axes = [0] * len(xs)
+    if any(axis not in (0, None) for axis in in_axes):
+        raise ValueError('only in_axes of 0 or None are supported')
+    sizes = {len(x.data) for x, axis in zip(xs, in_axes) if axis == 0}
+    if len(sizes) != 1:
+        raise ValueError('batched inputs must share one leading size, got {}'.format(sorted(sizes)))
+    size, = sizes
+
+    inputs = []
+    for x, axis in zip(xs, in_axes):
+        if axis is None:
+            x = Variable(np.broadcast_to(x.data, (size,) + x.data.shape))  # 複製せずにサンプルの数だけ並べる。
+        else:
+            x = Variable(x.data)  # 呼び出し側のVariableの微分値は書き換えない。
+        inputs.append(x)
+    with using_config('enable_backprop', True):
+        y = f(*inputs)
+    y.backward()
+    return tuple(x.grad for x in inputs)
@@ -1,3 +1,4 @@
+import heapq
 import numpy as np
 
 
@@ -46,17 +47,16 @@ class Variable:
         seen_set = set()
 
         def add_func(f):
-            """逆伝播をする関数の順番を世代で並び替える。"""
+            """逆伝播をする関数を世代の大きい順に取り出せるようにヒープへ追加する。"""
             if f not in seen_set:
-                funcs.append(f)
+                # heapqは最小値から取り出すので世代の符号を反転する。同じ世代は追加順で取り出す。
+                heapq.heappush(funcs, (-f.generation, len(seen_set), f))
                 seen_set.add(f)
-                funcs.sort(key=lambda x: x.generation)
 
         add_func(self.creator)
 
-        funcs = [self.creator]
         while funcs:
-            f = funcs.pop()  # 1. 変数を生み出した関数を取得する。
+            _, _, f = heapq.heappop(funcs)  # 1. 変数を生み出した関数を取得する。
             gys = [output.grad for output in f.outputs]  # 2. 変数を生み出した関数の出力値を取得する。
             gxs = f.backward(*gys)  # 3. 変数を生み出した関数の逆伝播を呼び出す。
             if not isinstance(gxs, tuple):
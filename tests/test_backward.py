@@ -0,0 +1,132 @@
+import unittest
+import numpy as np
+from dezero import Variable, BackwardPlan, square, exp, add, mul
+from dezero.utils import hvp
+
+
+class BackwardTest(unittest.TestCase):
+    """Variable.backwardのテスト。"""
+
+    def test_diamond(self):
+        x = Variable(np.array(2.0))
+        a = square(x)
+        y = add(square(a), square(a))
+        y.backward()
+        self.assertEqual(y.data, np.array(32.0))
+        self.assertEqual(x.grad, np.array(64.0))
+
+    def test_wide_graph(self):
+        xs = [Variable(np.array(float(i))) for i in range(100)]
+        y = square(xs[0])
+        for x in xs[1:]:
+            y = add(y, square(x))
+        y.backward()
+        for i, x in enumerate(xs):
+            self.assertEqual(x.grad, np.array(2.0 * i))
+
+    def test_broadcast(self):
+        x0 = Variable(np.array([1.0, 2.0, 3.0]))
+        x1 = Variable(np.array(10.0))
+        y = add(x0, x1)
+        y.backward()
+        self.assertTrue(np.array_equal(x0.grad, np.ones(3)))
+        self.assertEqual(x1.grad, np.array(3.0))
+
+    def test_fan_out(self):
+        x = Variable(np.array([1.0, 2.0]))
+        a = add(x, x)
+        y = add(add(a, x), x)
+        y.backward(retain_grad=True)
+        self.assertTrue(np.array_equal(x.grad, np.array([4.0, 4.0])))
+        self.assertTrue(np.array_equal(a.grad, np.array([1.0, 1.0])))  # 上流の微分値は書き換えない。
+        self.assertTrue(np.array_equal(y.grad, np.array([1.0, 1.0])))
+
+
+class BackwardPlanTest(unittest.TestCase):
+    """BackwardPlanのテスト。"""
+
+    def diamond(self, x):
+        a = square(x)
+        return add(square(a), square(a))
+
+    def test_replay(self):
+        plan = None
+        for value in [2.0, 3.0, 0.5]:
+            x = Variable(np.array(value))
+            y = self.diamond(x)
+            if plan is None:
+                plan = BackwardPlan.record(y)
+            y.backward(plan=plan)
+            self.assertEqual(x.grad, np.array(8 * value ** 3))
+        self.assertEqual(len(plan.types), 4)
+
+    def test_mismatch(self):
+        plan = BackwardPlan.record(self.diamond(Variable(np.array(2.0))))
+        x = Variable(np.array(2.0))
+        y = add(square(square(x)), square(x))
+        with self.assertRaises(ValueError):
+            y.backward(plan=plan)
+
+
+class CreateGraphTest(unittest.TestCase):
+    """create_graph=Trueによる高階微分のテスト。"""
+
+    def test_second_derivative(self):
+        x = Variable(np.array(2.0))
+        y = square(square(x))
+        y.backward(create_graph=True)
+        gx = x.grad
+        self.assertIsInstance(gx, Variable)
+        self.assertEqual(gx.data, np.array(32.0))
+        x.cleargrad()
+        gx.backward()
+        self.assertEqual(x.grad, np.array(48.0))
+
+    def test_newton(self):
+        x = Variable(np.array(2.0))
+        for _ in range(10):  # f(x) = x^4 + exp(x^2) の最小値をニュートン法で探す。
+            y = add(square(square(x)), exp(square(x)))
+            x.cleargrad()
+            y.backward(create_graph=True)
+            gx = x.grad
+            x.cleargrad()
+            gx.backward()
+            x = Variable(np.array(x.data - gx.data / x.grad))
+        self.assertTrue(np.allclose(x.data, 0.0))
+
+    def test_hvp(self):
+        c = Variable(np.random.rand(5))
+        fn = lambda x: exp(add(mul(x, x), c))
+        x = Variable(np.random.rand(5))
+        v = np.random.rand(5)
+        expected = (2 + 4 * x.data ** 2) * np.exp(x.data ** 2 + c.data) * v
+        self.assertTrue(np.allclose(hvp(fn, x, v), expected))
+
+    def test_hvp_linear(self):
+        c = Variable(np.random.rand(5))
+        x = Variable(np.random.rand(5))
+        v = np.random.rand(5)
+        for fn in (lambda x: add(x, c), lambda x: mul(x, c)):  # 微分値がxに依存しないのでヘッセ行列は0。
+            hv = hvp(fn, x, v)
+            self.assertEqual(hv.shape, x.data.shape)
+            self.assertTrue(np.array_equal(hv, np.zeros(5)))
+
+
+class ParallelBackwardTest(unittest.TestCase):
+    """同じ世代の関数を並列に逆伝播するテスト。"""
+
+    def test_same_as_serial(self):
+        def fn(x, y):
+            z = add(square(x), square(y))  # step13のように独立な枝を持つ計算グラフ。
+            for _ in range(5):
+                z = add(z, exp(square(x)))  # 共有する入力xに多くの枝から微分値を足し込む。
+            return z
+
+        grads = []
+        for parallel in (False, True):
+            x = Variable(np.linspace(0.0, 1.0, 100))
+            y = Variable(np.linspace(1.0, 2.0, 100))
+            fn(x, y).backward(parallel=parallel)
+            grads.append((x.grad, y.grad))
+        self.assertTrue(np.array_equal(grads[0][0], grads[1][0]))
+        self.assertTrue(np.array_equal(grads[0][1], grads[1][1]))
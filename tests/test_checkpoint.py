@@ -0,0 +1,89 @@
+import concurrent.futures
+import unittest
+import weakref
+import numpy as np
+from dezero import Variable, square, exp, add, mul
+from dezero import core_simple
+from dezero.checkpoint import checkpoint, checkpoint_sequential, segment_size
+
+
+class CheckpointTest(unittest.TestCase):
+    """checkpointのテスト。"""
+
+    def test_recompute(self):
+        calls = []
+        refs = []
+
+        def fn(x):
+            calls.append(x)
+            h = square(x)
+            refs.append((weakref.ref(h), weakref.ref(h.data)))
+            return exp(h)
+
+        x = Variable(np.random.rand(5))
+        y0 = fn(x)
+        self.assertIsNotNone(refs[-1][0]())  # 普通に順伝播すると途中の値は計算グラフに残る。
+        del y0
+        y = checkpoint(fn, x)
+        self.assertTrue(all(ref() is None for ref in refs[-1]))  # 区間の中の値は変数も配列も残らない。
+        y.backward()
+        self.assertEqual(len(calls), 3)
+        expected = 2 * x.data * np.exp(x.data ** 2)
+        self.assertTrue(np.allclose(x.grad, expected))
+
+    def test_outer_variable(self):
+        u = Variable(np.random.rand(5))
+        x = Variable(np.random.rand(5))
+        w = square(u)
+        y = checkpoint(lambda v: mul(v, w), x)
+        with self.assertRaises(ValueError):
+            add(y, w).backward()
+
+        u.grad = x.grad = None
+        w = square(u)
+        y = checkpoint(lambda v, w: mul(v, w), x, w)
+        add(y, w).backward()
+        self.assertTrue(np.allclose(x.grad, u.data ** 2))
+        self.assertTrue(np.allclose(u.grad, 2 * u.data * (x.data + 1)))
+
+    def test_parallel_backward(self):
+        fn = lambda v: exp(square(v))
+        saved = core_simple._executors.get('backward')
+        core_simple._executors['backward'] = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        try:
+            for _ in range(20):
+                x = Variable(np.random.rand(100))
+                z = Variable(np.random.rand(100))
+                add(checkpoint(fn, x), checkpoint(fn, z)).backward(parallel=True)  # 同じ世代の2つの区間。
+                self.assertTrue(np.allclose(x.grad, 2 * x.data * np.exp(x.data ** 2)))
+                self.assertTrue(np.allclose(z.grad, 2 * z.data * np.exp(z.data ** 2)))
+        finally:
+            core_simple._executors['backward'].shutdown()
+            if saved is None:
+                del core_simple._executors['backward']
+            else:
+                core_simple._executors['backward'] = saved
+
+
+class CheckpointSequentialTest(unittest.TestCase):
+    """checkpoint_sequentialのテスト。"""
+
+    def test_same_grad(self):
+        functions = [square] * 10
+        x0 = Variable(1 + np.random.rand(4) * 1e-3)
+        x1 = Variable(x0.data.copy())
+        y0 = x0
+        for f in functions:
+            y0 = f(y0)
+        y1 = checkpoint_sequential(functions, x1, segment=3)
+        y0.backward()
+        y1.backward()
+        self.assertTrue(np.allclose(y0.data, y1.data))
+        self.assertTrue(np.allclose(x0.grad, x1.grad))
+
+    def test_segment_size(self):
+        self.assertEqual(segment_size(100), 10)
+        self.assertIsNone(segment_size(100, max_activations=100))
+        self.assertEqual(segment_size(100, max_activations=20), 10)
+        with self.assertRaises(ValueError):
+            segment_size(100, max_activations=19)
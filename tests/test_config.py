@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+from dezero import Variable, Config, using_config, no_grad, as_array, square, exp, add
+
+
+class NoGradTest(unittest.TestCase):
+    """no_gradのテスト。"""
+
+    def test_no_graph(self):
+        x = Variable(np.array(2.0))
+        with no_grad():
+            y = square(square(x))
+        self.assertEqual(y.data, np.array(16.0))
+        self.assertIsNone(y.creator)
+        self.assertEqual(y.generation, 0)
+
+    def test_restore(self):
+        with using_config('enable_backprop', False):
+            self.assertFalse(Config.enable_backprop)
+        self.assertTrue(Config.enable_backprop)
+
+        x = Variable(np.array(3.0))
+        y = square(x)
+        y.backward()
+        self.assertEqual(x.grad, np.array(6.0))
+
+
+class DtypeTest(unittest.TestCase):
+    """Config.dtypeのテスト。"""
+
+    def test_float32(self):
+        x = Variable(np.random.rand(5))
+        with using_config('dtype', np.float32):
+            y = exp(square(x))
+            y.backward()
+            self.assertEqual(as_array(1.0).dtype, np.float32)
+        self.assertEqual(y.data.dtype, np.float32)
+        self.assertEqual(x.grad.dtype, np.float32)
+        self.assertEqual(x.data.dtype, np.float64)  # 末端の変数の値はそのまま。
+        self.assertTrue(np.allclose(x.grad, 2 * x.data * np.exp(x.data ** 2), rtol=1e-5))
+
+    def test_float16_accumulates_in_float32(self):
+        x = Variable(np.full(3, 0.1))
+        with using_config('dtype', np.float16):
+            y = x
+            for _ in range(100):
+                y = add(y, x)
+            y.backward()
+        self.assertEqual(y.data.dtype, np.float16)
+        self.assertEqual(x.grad.dtype, np.float32)
+        self.assertTrue(np.all(x.grad == 101))
+
+    def test_default(self):
+        self.assertIsNone(Config.dtype)
+        x = Variable(np.arange(3, dtype=np.float32))
+        y = square(x)
+        y.backward()
+        self.assertEqual(as_array(1.0).dtype, np.float64)
+        self.assertEqual(x.grad.dtype, np.float32)
@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+from dezero import Variable, SumTo, using_config, no_grad, square, add
+from dezero.cse import CSETable
+
+
+class CSETableTest(unittest.TestCase):
+    """共通部分式の除去のテスト。"""
+
+    def test_step16(self):
+        table = CSETable()
+        a = Variable(np.array(2.0))
+        with using_config('cse', table):
+            y = add(square(a), square(a))
+        x0, x1 = y.creator.inputs
+        self.assertIs(x0, x1)
+        self.assertEqual((table.hits, table.misses), (1, 2))
+        y.backward()
+        self.assertEqual(y.data, 8.0)
+        self.assertEqual(a.grad, 8.0)
+
+    def test_params(self):
+        x = Variable(np.ones((2, 3)))
+        with using_config('cse', CSETable()):
+            y0 = SumTo((1, 3))(x)
+            y1 = SumTo((1, 3))(x)
+            y2 = SumTo((2, 1))(x)
+        self.assertIs(y0, y1)
+        self.assertIsNot(y0, y2)
+
+    def test_freed_graph(self):
+        a = Variable(np.array(3.0))
+        with using_config('cse', CSETable()):
+            y0 = square(a)
+            y0.backward()  # 計算グラフを切ったので、y0は逆伝播に使えない。
+            a.cleargrad()
+            y1 = square(a)
+            y1.backward()
+            with no_grad():
+                y2 = square(a)
+        self.assertIsNot(y0, y1)
+        self.assertEqual(a.grad, 6.0)
+        self.assertIs(y2, y1)  # 値だけなら計算グラフのない出力でもよい。
+
+    def test_new_data(self):
+        a = Variable(np.array(3.0))
+        with using_config('cse', CSETable()):
+            y0 = square(a)
+            a.data = np.array(4.0)
+            y1 = square(a)
+        self.assertEqual(y1.data, 16.0)
+
+    def test_reused_data_id(self):
+        a = Variable(np.array(2.0))
+        with using_config('cse', CSETable()), no_grad():
+            for v in range(3, 9):
+                a.data = None  # 前の配列を解放すると、新しい配列が同じidを使い回すことがある。
+                a.data = np.array(float(v))
+                y = square(a)
+                self.assertEqual(y.data, v ** 2)
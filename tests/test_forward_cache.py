@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+from dezero import Variable, SumTo, using_config, no_grad, square, exp
+from dezero.forward_cache import ForwardCache
+from dezero.utils import numerical_diff, numerical_grad, numerical_jacobian
+
+
+class ForwardCacheTest(unittest.TestCase):
+    """ForwardCacheのテスト。"""
+
+    def test_numerical_diff(self):
+        cache = ForwardCache()
+        f = lambda x: exp(square(x))
+        x = Variable(np.array(0.5))
+        with using_config('forward_cache', cache):
+            d0 = numerical_diff(f, x)
+            d1 = numerical_diff(f, x)
+        self.assertEqual(d0, d1)
+        self.assertEqual((cache.hits, cache.misses), (4, 4))
+
+    def test_numerical_grad(self):
+        cache = ForwardCache()
+        f = lambda x: exp(square(x))
+        x = Variable(np.random.rand(5))
+        expected = numerical_grad(f, x)
+        with using_config('forward_cache', cache):  # キャッシュの出力は書き込みできないが、勾配は求まる。
+            g0 = numerical_grad(f, x)
+            g1 = numerical_grad(f, x)
+            jacobian = numerical_jacobian(f, x)
+        self.assertTrue(np.allclose(g0, expected))
+        self.assertTrue(np.array_equal(g0, g1))
+        self.assertTrue(np.allclose(jacobian, np.diag(expected)))
+        self.assertGreater(cache.hits, 0)
+
+    def test_content_key(self):
+        cache = ForwardCache()
+        with using_config('forward_cache', cache), no_grad():
+            y0 = square(Variable(np.array([1.0, 2.0])))
+            y1 = square(Variable(np.array([1.0, 2.0])))  # 別のVariableでも中身が同じなら使い回す。
+            y2 = square(Variable(np.array([1.0, 3.0])))
+            y3 = SumTo((1,))(Variable(np.array([1.0, 2.0])))
+            y4 = SumTo(())(Variable(np.array([1.0, 2.0])))
+        self.assertTrue(np.array_equal(y1.data, y0.data))
+        self.assertFalse(y1.data.flags.writeable)
+        self.assertTrue(np.array_equal(y2.data, [1.0, 9.0]))
+        self.assertEqual(y3.data.shape, (1,))
+        self.assertEqual(y4.data.shape, ())
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+
+    def test_backprop_not_cached(self):
+        cache = ForwardCache()
+        x = Variable(np.array(3.0))
+        with using_config('forward_cache', cache):
+            square(x)
+            y = square(x)
+        y.backward()
+        self.assertEqual(x.grad, 6.0)
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+
+    def test_lru(self):
+        cache = ForwardCache(max_bytes=16 * 3)
+        with using_config('forward_cache', cache), no_grad():
+            for value in (1.0, 2.0, 3.0, 1.0, 4.0):
+                square(Variable(np.array([value, value])))
+            self.assertEqual(cache.nbytes, 16 * 3)
+            square(Variable(np.array([1.0, 1.0])))
+            square(Variable(np.array([2.0, 2.0])))  # 1.0を使い直したので、先に捨てられたのは2.0。
+        self.assertEqual((cache.hits, cache.misses), (2, 5))
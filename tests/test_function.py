@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from dezero import Variable, Exp, square, exp, add, no_grad, using_config
+
+
+class SaveForBackwardTest(unittest.TestCase):
+    """Function.save_for_backwardのテスト。"""
+
+    def test_exp_saves_output(self):
+        x = Variable(np.array([0.0, 1.0]))
+        y = exp(x)
+        self.assertIs(y.creator.saved_tensors[0], y.data)
+        y.backward()
+        self.assertTrue(np.allclose(x.grad, np.exp(x.data)))
+
+    def test_square_saves_input(self):
+        x = Variable(np.array([3.0]))
+        y = square(x)
+        f = y.creator
+        self.assertIs(f.saved_tensors[0], x.data)
+        f.inputs = (Variable(np.array([100.0])),)  # 逆伝播は入力の変数を参照しない。
+        self.assertEqual(f.backward(np.array([1.0])), np.array([6.0]))
+
+    def test_no_grad(self):
+        f = Exp()
+        with no_grad():
+            f(Variable(np.array(1.0)))
+        self.assertEqual(f.saved_tensors, ())
+
+
+class ParallelTest(unittest.TestCase):
+    """Config.num_threadsで要素ごとの計算を分けて実行するテスト。"""
+
+    def run_threads(self, fn, *xs):
+        with using_config('num_threads', 3), using_config('parallel_threshold', 10):
+            return fn(*xs)
+
+    def test_same_as_serial(self):
+        data = np.random.rand(4, 25)
+        x0 = Variable(data)
+        x1 = Variable(data.copy())
+        y0 = exp(square(x0))
+        y1 = self.run_threads(lambda x: exp(square(x)), x1)
+        y0.backward()
+        self.run_threads(y1.backward)
+        self.assertTrue(np.allclose(y0.data, y1.data))
+        self.assertTrue(np.allclose(x0.grad, x1.grad))
+
+    def test_dtype(self):
+        y = self.run_threads(exp, Variable(np.arange(20)))
+        self.assertEqual(y.data.dtype, np.float64)
+        self.assertTrue(np.allclose(y.data, np.exp(np.arange(20))))
+
+    def test_broadcast_falls_back(self):
+        x0 = Variable(np.random.rand(5, 20))
+        x1 = Variable(np.random.rand(20))
+        y = self.run_threads(add, x0, x1)
+        self.assertTrue(np.allclose(y.data, x0.data + x1.data))
@@ -0,0 +1,91 @@
+import io
+import time
+import unittest
+import numpy as np
+from dezero import Variable, Function, Config, using_config, no_grad, square, exp, add
+from dezero.cse import CSETable
+from dezero.forward_cache import ForwardCache
+from dezero.function_hooks import FunctionHook, ProfileHook
+
+
+class FunctionHookTest(unittest.TestCase):
+    """FunctionHookのテスト。"""
+
+    def test_order(self):
+        events = []
+
+        class Recorder(FunctionHook):
+            def forward_preprocess(self, f, inputs):
+                events.append(('forward_pre', type(f).__name__))
+
+            def forward_postprocess(self, f, inputs, outputs):
+                events.append(('forward_post', type(f).__name__))
+
+            def backward_postprocess(self, f, gys, gxs):
+                events.append(('backward_post', type(f).__name__))
+
+        x = Variable(np.array(2.0))
+        with Recorder():
+            y = exp(square(x))
+            y.backward()
+        square(x)  # with文の外では呼び出されない。
+        self.assertEqual(Config.function_hooks, ())
+        self.assertEqual(events, [
+            ('forward_pre', 'Square'), ('forward_post', 'Square'),
+            ('forward_pre', 'Exp'), ('forward_post', 'Exp'),
+            ('backward_post', 'Exp'), ('backward_post', 'Square'),
+        ])
+
+
+class ProfileHookTest(unittest.TestCase):
+    """ProfileHookのテスト。"""
+
+    def test_stats(self):
+        x = Variable(np.ones(100))
+        with ProfileHook() as hook:
+            y = add(square(x), square(x))
+            y.backward()
+        stats = hook.stats
+        self.assertEqual(stats['Square']['calls'], 2)
+        self.assertEqual(stats['Add']['calls'], 1)
+        self.assertEqual(stats['Square']['bytes'], 2 * 2 * 800)  # 順伝播と逆伝播でそれぞれ800バイトの配列を確保する。
+        self.assertEqual(stats['Add']['bytes'], 800)  # 逆伝播はgyをそのまま返すので確保しない。
+        self.assertGreater(stats['Square']['backward_s'], 0)
+        names = [row['name'] for row in hook.summary()]
+        self.assertEqual(sorted(names), ['Add', 'Square'])
+
+        out = io.StringIO()
+        hook.print_report(file=out)
+        self.assertIn('Square', out.getvalue())
+
+    def test_hits(self):
+        a = Variable(np.ones(100))
+        with using_config('cse', CSETable()), ProfileHook() as hook:
+            ys = [square(a) for _ in range(5)]
+        stat = hook.stats['Square']
+        self.assertEqual((stat['calls'], stat['hits'], stat['bytes']), (5, 4, 800))  # 確保したのは最初の1回だけ。
+
+        with using_config('forward_cache', ForwardCache()), no_grad(), ProfileHook() as hook:
+            for _ in range(3):
+                square(Variable(np.ones(100)))
+        stat = hook.stats['Square']
+        self.assertEqual((stat['calls'], stat['hits']), (3, 2))
+
+    def test_exception(self):
+        class Failing(Function):
+            def forward(self, x):
+                raise ValueError()
+
+        class Outer(Function):
+            def forward(self, x):
+                time.sleep(0.01)
+                try:
+                    Failing()(Variable(x))  # 後処理が呼ばれない呼び出し。
+                except ValueError:
+                    pass
+                return x
+
+        with ProfileHook() as hook:
+            Outer()(Variable(np.ones(3)))
+        self.assertGreaterEqual(hook.stats['Outer']['forward_s'], 0.01)
+        self.assertNotIn('Failing', hook.stats)
@@ -0,0 +1,31 @@
+import unittest
+import numpy as np
+from dezero import Variable, square, exp, add, no_grad
+from dezero.fusion import fuse
+
+
+class FuseTest(unittest.TestCase):
+    """fuseのテスト。"""
+
+    def test_forward_backward(self):
+        fn = lambda x: square(exp(square(x)))
+        fused = fuse(fn)
+        x0 = Variable(np.random.rand(10))
+        x1 = Variable(x0.data.copy())
+        y0 = fn(x0)
+        y1 = fused(x1)
+        y0.backward()
+        y1.backward()
+        self.assertTrue(np.allclose(y0.data, y1.data))
+        self.assertTrue(np.allclose(x0.grad, x1.grad))
+
+    def test_trace_in_no_grad(self):
+        fused = fuse(lambda x: exp(square(x)))
+        with no_grad():
+            y = fused(Variable(np.array(1.0)))
+        self.assertTrue(np.allclose(y.data, np.exp(1.0)))
+
+    def test_not_chain(self):
+        fused = fuse(lambda x: add(square(x), x))
+        with self.assertRaises(ValueError):
+            fused(Variable(np.array(1.0)))
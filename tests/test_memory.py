@@ -0,0 +1,104 @@
+import tracemalloc
+import unittest
+import weakref
+import numpy as np
+from dezero import Variable, using_config, square, exp
+from dezero.memory_pool import MemoryPool
+
+
+def backward_peak(size, retain_grad):
+    """steps/step17.pyのshow_memと同じ計算グラフで、逆伝播中に増えたメモリの最大値を配列の個数で返す。"""
+    x = Variable(np.random.randn(size))
+    y = square(square(square(x)))
+    tracemalloc.start()
+    y.backward(retain_grad=retain_grad)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return x, y, peak / x.data.nbytes
+
+
+class RetainGradTest(unittest.TestCase):
+    """逆伝播で途中の微分値を消去するテスト。"""
+
+    def test_intermediate_grads(self):
+        x = Variable(np.array(2.0))
+        a = square(x)
+        y = square(a)
+        y.backward(retain_graph=True)
+        self.assertIsNone(y.grad)
+        self.assertIsNone(a.grad)
+        self.assertEqual(x.grad, np.array(32.0))
+
+        x.cleargrad()
+        y.backward(retain_grad=True)
+        self.assertEqual(y.grad, np.array(1.0))
+        self.assertEqual(a.grad, np.array(8.0))
+        self.assertEqual(x.grad, np.array(32.0))
+
+    def test_backward_peak_memory(self):
+        size = 10 ** 6
+        _, _, peak = backward_peak(size, retain_grad=False)
+        _, _, retained_peak = backward_peak(size, retain_grad=True)
+        self.assertLess(peak, 2.5)
+        self.assertLess(peak, retained_peak)
+
+
+class RetainGraphTest(unittest.TestCase):
+    """逆伝播後に計算グラフを解放するテスト。"""
+
+    def test_release_graph(self):
+        x = Variable(np.array(2.0))
+        a = square(x)
+        f = a.creator
+        y = square(a)
+        y.backward()
+        self.assertEqual(x.grad, np.array(32.0))
+        self.assertIsNone(y.creator)
+        self.assertIsNone(a.creator)
+        self.assertIsNone(f.inputs)
+        self.assertIsNone(f.outputs)
+
+    def test_release_activations(self):
+        x = Variable(np.random.randn(1000))
+        a = square(x)
+        ref = weakref.ref(a)
+        y = square(square(a))
+        del a
+        y.backward(retain_graph=True)
+        self.assertIsNotNone(ref())
+        y = square(square(ref()))
+        y.backward()
+        self.assertIsNone(ref())  # 途中の変数は逆伝播の後、GCを待たずに解放される。
+
+
+class MemoryPoolTest(unittest.TestCase):
+    """MemoryPoolのテスト。"""
+
+    def test_reuse(self):
+        pool = MemoryPool()
+        with using_config('memory_pool', pool):
+            for _ in range(5):
+                x = Variable(np.random.randn(100))
+                y = square(exp(square(x)))
+                y.backward()
+                expected = 4 * x.data * np.exp(2 * x.data ** 2)
+                self.assertTrue(np.allclose(x.grad, expected))
+        self.assertGreater(pool.hits, pool.misses)
+
+    def test_referenced_array(self):
+        pool = MemoryPool()
+        a = np.ones(3)
+        b = a
+        pool.release(a)  # bからも参照されているので戻さない。
+        self.assertEqual(pool.nbytes, 0)
+        pool.release(np.ones(3))
+        self.assertEqual(pool.nbytes, 24)
+
+    def test_lru(self):
+        pool = MemoryPool(max_bytes=110)
+        pool.release(np.ones(5))
+        pool.release(np.ones(6))
+        pool.release(np.ones(7))  # 合計144バイトなので、最も古い5要素の配列を捨てる。
+        self.assertEqual(pool.nbytes, 104)
+        pool.empty((5,), np.float64)
+        self.assertEqual(pool.misses, 1)
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from dezero import Variable, Function, SumTo, square, exp, add, mul
+from dezero.serialize import save_graph, load_graph
+
+
+class Scale(Function):
+    """__init__の引数がJSONで表せない関数。"""
+    __slots__ = ('c',)
+
+    def __init__(self, c):
+        self.c = c
+
+    def forward(self, x):
+        return x * self.c
+
+
+class SerializeTest(unittest.TestCase):
+    """save_graphとload_graphのテスト。"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'graph.dzg')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def build(self, x, b):
+        return SumTo((1, 4))(add(mul(exp(square(x)), Variable(np.array(0.5))), b))
+
+    def test_run(self):
+        x = Variable(np.random.rand(3, 4))
+        b = Variable(np.random.rand(4))
+        y = self.build(x, b)
+        save_graph(self.path, y, inputs=[x])
+
+        graph = load_graph(self.path)
+        self.assertEqual([f[0].__name__ for f in graph.functions], ['Square', 'Exp', 'Mul', 'Add', 'SumTo'])
+        self.assertTrue(np.array_equal(graph.run().data, y.data))
+        self.assertIsInstance(graph.data[graph.inputs[0]], np.memmap)
+
+        x1 = Variable(np.random.rand(3, 4))
+        y1 = graph.run(x1)
+        y1.backward()
+        x2 = Variable(x1.data.copy())
+        self.build(x2, b).backward()
+        self.assertTrue(np.allclose(y1.data, self.build(x2, b).data))
+        self.assertTrue(np.allclose(x1.grad, x2.grad))
+
+    def test_compile(self):
+        x = Variable(np.random.rand(5))
+        y = exp(square(x))
+        save_graph(self.path, y, inputs=[x])
+        static = load_graph(self.path, mmap=False).compile()
+        data = np.random.rand(5)
+        self.assertTrue(np.allclose(static.forward(data), np.exp(data ** 2)))
+
+    def test_without_data(self):
+        x = Variable(np.random.rand(5))
+        save_graph(self.path, square(x), inputs=[x], save_data=False)
+        graph = load_graph(self.path)
+        with self.assertRaises(ValueError):
+            graph.run()
+        self.assertTrue(np.allclose(graph.run(np.ones(5)).data, 1.0))
+
+    def test_errors(self):
+        x = Variable(np.random.rand(5))
+        with self.assertRaises(ValueError):
+            save_graph(self.path, Scale(2 + 0j)(x))
+        with open(self.path, 'wb') as f:
+            f.write(b'not a graph')
+        with self.assertRaises(ValueError):
+            load_graph(self.path)
+
+    def test_freed_graph(self):
+        x = Variable(np.ones(2))
+        y = square(x)
+        y.backward()  # retain_graph=Falseで計算グラフが切られる。
+        with self.assertRaises(ValueError):
+            save_graph(self.path, y, inputs=[x])
+        with self.assertRaises(ValueError):
+            save_graph(self.path, exp(y), inputs=[x])
+
+        y = square(x)
+        y.backward(retain_graph=True)
+        save_graph(self.path, y, inputs=[x])
+        self.assertTrue(np.allclose(load_graph(self.path).run(np.full(2, 5.)).data, 25.0))
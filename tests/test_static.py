@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+from dezero import Variable, square, exp, add
+from dezero.static import trace
+
+
+def diamond(x):
+    a = square(x)
+    return add(square(a), square(a))
+
+
+class StaticGraphTest(unittest.TestCase):
+    """dezero.static.traceのテスト。"""
+
+    def test_forward_backward(self):
+        graph = trace(diamond, np.array(2.0))
+        for value in [2.0, 3.0]:
+            y = graph.forward(np.array(value))
+            gx = graph.backward()
+            self.assertEqual(y, np.array(2 * value ** 4))
+            self.assertEqual(gx, np.array(8 * value ** 3))
+
+    def test_matches_eager(self):
+        c = Variable(np.random.rand(3))
+        fn = lambda x0, x1: add(square(exp(x0)), add(x1, c))  # cはブロードキャストされる。
+        x0, x1 = np.random.rand(2, 3), np.random.rand(2, 3)
+        graph = trace(fn, x0, x1)
+        y = graph.forward(x0, x1)
+        gx0, gx1 = graph.backward()
+
+        v0, v1 = Variable(x0), Variable(x1)
+        expected = fn(v0, v1)
+        expected.backward()
+        self.assertTrue(np.allclose(y, expected.data))
+        self.assertTrue(np.allclose(gx0, v0.grad))
+        self.assertTrue(np.allclose(gx1, v1.grad))
+
+    def test_shape_mismatch(self):
+        graph = trace(diamond, np.array(2.0))
+        with self.assertRaises(ValueError):
+            graph.forward(np.array([2.0]))
+
+    def test_integer_input(self):
+        x = np.arange(3)
+        graph = trace(lambda x: add(exp(x), square(x)), x)
+        graph.forward(x)
+        gx = graph.backward()
+
+        v = Variable(x)
+        add(exp(v), square(v)).backward()
+        self.assertEqual(gx.dtype, v.grad.dtype)
+        self.assertTrue(np.allclose(gx, v.grad))
@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+from dezero import Variable, SumTo, square, exp, add, mul
+from dezero.utils import numerical_diff, numerical_grad, numerical_jacobian, jvp, vmap_grad
+
+
+class NumericalGradTest(unittest.TestCase):
+    """dezero.utilsの数値微分のテスト。"""
+
+    def test_numerical_diff(self):
+        x = Variable(np.array(2.0))
+        self.assertTrue(np.allclose(numerical_diff(square, x), 4.0))
+
+    def test_gradient_check(self):
+        x = Variable(np.random.rand(1000))
+        y = square(exp(x))
+        y.backward()
+        num_grad = numerical_grad(lambda x: square(exp(x)), x)
+        self.assertTrue(np.allclose(x.grad, num_grad))
+
+    def test_jacobian(self):
+        x = Variable(np.random.rand(2, 3))
+        c = Variable(np.random.rand(3))
+        jacobian = numerical_jacobian(lambda x: add(square(x), c), x, max_elements=10)
+        self.assertEqual(jacobian.shape, (2, 3, 2, 3))
+        expected = np.diag(2 * x.data.reshape(-1)).reshape(2, 3, 2, 3)
+        self.assertTrue(np.allclose(jacobian, expected))
+
+
+class JvpTest(unittest.TestCase):
+    """前進モードの自動微分のテスト。"""
+
+    def test_matches_backward(self):
+        fn = lambda x: square(exp(square(x)))
+        x = Variable(np.random.rand(10))
+        y, ty = jvp(fn, [x], [np.ones(10)])
+        fn(x).backward()
+        self.assertTrue(np.allclose(ty, x.grad))  # 要素ごとの関数なのでヤコビ行列は対角。
+        self.assertIsNone(x.tangent)
+
+    def test_tall_jacobian(self):
+        c = Variable(np.random.rand(50))
+        fn = lambda x: exp(add(square(x), c))  # スカラーの入力から50個の出力。
+        x = Variable(np.array(0.3))
+        y, ty = jvp(fn, [x], [np.array(1.0)])
+        expected = 2 * x.data * np.exp(x.data ** 2 + c.data)
+        self.assertEqual(ty.shape, (50,))
+        self.assertTrue(np.allclose(ty, expected))
+
+    def test_broadcast_sum(self):
+        c = Variable(np.ones(50))
+        fn = lambda x: SumTo(())(add(x, c))  # xを50個にブロードキャストしてから和を取る。
+        x = Variable(np.array(0.3))
+        y, ty = jvp(fn, [x], [np.array(1.0)])
+        fn(x).backward()
+        self.assertEqual(np.shape(ty), ())
+        self.assertTrue(np.allclose(ty, x.grad))
+        self.assertTrue(np.allclose(ty, 50.0))
+
+
+class VmapGradTest(unittest.TestCase):
+    """サンプルごとの微分値のテスト。"""
+
+    def test_matches_loop(self):
+        fn = lambda x, w: exp(mul(square(x), w))
+        xs = Variable(np.random.rand(8, 3))
+        w = Variable(np.random.rand(3))
+        gxs, gws = vmap_grad(fn, [xs, w], in_axes=[0, None])
+        self.assertEqual(gws.shape, (8, 3))
+        for i in range(8):
+            x = Variable(xs.data[i])
+            w.cleargrad()
+            fn(x, w).backward()
+            self.assertTrue(np.allclose(gxs[i], x.grad))
+            self.assertTrue(np.allclose(gws[i], w.grad))
+        self.assertIsNone(xs.grad)
+
+    def test_batch_size_mismatch(self):
+        with self.assertRaises(ValueError):
+            vmap_grad(add, [Variable(np.ones((2, 3))), Variable(np.ones((4, 3)))])